@@ -1,12 +1,12 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from fastapi.middleware.cors import CORSMiddleware
 from urllib.parse import unquote, urlparse
 from typing import List
 from pydantic import BaseModel
-from git import Repo, GitCommandError, InvalidGitRepositoryError, NULL_TREE
+from git import Repo, Git, GitCommandError, InvalidGitRepositoryError, NoSuchPathError, RemoteProgress, NULL_TREE
 from github import Github
 import os 
 from typing import Optional
@@ -14,7 +14,32 @@ import requests
 import locale
 import datetime
 import logging
-from collections import deque
+import asyncio
+import multiprocessing
+import base64
+import codecs
+import contextvars
+import ctypes
+import ctypes.util
+import fnmatch
+import functools
+import itertools
+import json
+import mimetypes
+import re
+import shutil
+import sqlite3
+import struct
+import subprocess
+import tempfile
+import unicodedata
+import uuid
+import threading
+import time
+import weakref
+from collections import deque, OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import closing
 
 path_stack = deque()
 
@@ -34,6 +59,212 @@ app.add_middleware(
 
 app.mount("/frontend/static", StaticFiles(directory="frontend/build/static"), name="static")
 
+
+# Instrumentation
+# 요청별 wall time, git 프로세스 수/시간, 파일시스템 호출 수, 응답 크기를 모아 /metrics 로 노출한다.
+SERVER_TIMING = os.environ.get("FILEMANAGER_SERVER_TIMING", "") not in ("", "0")
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+REQUEST_COUNTERS = ("requests", "errors", "seconds", "git_processes", "git_seconds", "fs_calls", "response_bytes")
+
+
+class RequestMetrics:
+    __slots__ = ("started", "git_processes", "git_seconds", "fs_calls", "response_bytes")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.git_processes = 0
+        self.git_seconds = 0.0
+        self.fs_calls = 0
+        self.response_bytes = 0
+
+    def server_timing(self) -> str:
+        elapsed = (time.perf_counter() - self.started) * 1000
+        return f'app;dur={elapsed:.1f}, git;dur={self.git_seconds * 1000:.1f};desc="{self.git_processes} processes", ' \
+               f'fs;desc="{self.fs_calls} calls"'
+
+
+request_metrics = contextvars.ContextVar("request_metrics", default=None)
+request_totals = {}         # endpoint -> {counter: value}
+request_latency = {}        # endpoint -> cumulative bucket counts, last one is +Inf
+background_git = {"git_processes": 0, "git_seconds": 0.0}   # prefetch, clone jobs, watchers ...
+metrics_lock = threading.Lock()
+
+
+def count_fs_calls(count: int = 1):
+    metrics = request_metrics.get()
+    if metrics is not None:
+        metrics.fs_calls += count
+
+
+def record_git(metrics, seconds: float, processes: int = 1):
+    if metrics is not None:
+        metrics.git_processes += processes
+        metrics.git_seconds += seconds
+    else:
+        with metrics_lock:
+            background_git["git_processes"] += processes
+            background_git["git_seconds"] += seconds
+
+
+def watch_git_process(popen: subprocess.Popen, metrics, started: float):
+    """Attribute a streamed git process's run time once it is reaped (by whoever waits on it)."""
+    wait = popen.wait
+
+    def timed_wait(*args, **kwargs):
+        returncode = wait(*args, **kwargs)
+        if popen.__dict__.pop("wait", None) is not None:
+            record_git(metrics, time.perf_counter() - started, processes=0)
+        return returncode
+
+    popen.wait = timed_wait
+
+
+class InstrumentedGit(Git):
+    """Git command wrapper of the backend's own Repo handles; attributes git time to the request.
+
+    Only handles opened as InstrumentedRepo use it, so other GitPython users in
+    the process are left alone.
+    """
+
+    def execute(self, command, *args, **kwargs):
+        metrics = request_metrics.get()
+        started = time.perf_counter()
+        try:
+            result = super().execute(command, *args, **kwargs)
+        except Exception:
+            record_git(metrics, time.perf_counter() - started)
+            raise
+
+        if isinstance(result, Git.AutoInterrupt):
+            record_git(metrics, 0.0)
+            # persistent `cat-file --batch` processes live as long as the Repo; only count them
+            if kwargs.get("istream") is not subprocess.PIPE:
+                watch_git_process(result.proc, metrics, started)
+        else:
+            record_git(metrics, time.perf_counter() - started)
+        return result
+
+
+class InstrumentedRepo(Repo):
+    GitCommandWrapperType = InstrumentedGit
+
+
+def record_request(endpoint: str, metrics: RequestMetrics, status: int):
+    elapsed = time.perf_counter() - metrics.started
+    with metrics_lock:
+        totals = request_totals.setdefault(endpoint, dict.fromkeys(REQUEST_COUNTERS, 0))
+        totals["requests"] += 1
+        totals["errors"] += status >= 500
+        totals["seconds"] += elapsed
+        totals["git_processes"] += metrics.git_processes
+        totals["git_seconds"] += metrics.git_seconds
+        totals["fs_calls"] += metrics.fs_calls
+        totals["response_bytes"] += metrics.response_bytes
+
+        buckets = request_latency.setdefault(endpoint, [0] * (len(LATENCY_BUCKETS) + 1))
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if elapsed <= bound:
+                buckets[i] += 1
+        buckets[-1] += 1
+
+
+class InstrumentationMiddleware:
+    """Collect RequestMetrics for every HTTP request (pure ASGI, so streamed bodies are counted too)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        token = request_metrics.set(metrics)
+        status = 500
+
+        async def instrumented_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if SERVER_TIMING:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", metrics.server_timing().encode()))
+                    headers.append((b"timing-allow-origin", b"*"))
+                    message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                metrics.response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, instrumented_send)
+        finally:
+            request_metrics.reset(token)
+            endpoint = scope.get("endpoint")
+            record_request(getattr(endpoint, "__name__", "other"), metrics, status)
+
+
+app.add_middleware(InstrumentationMiddleware)
+
+
+def prometheus_labels(**labels) -> str:
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def render_metrics() -> str:
+    """Prometheus text exposition of the request and git counters."""
+    with metrics_lock:
+        totals = {key: dict(values) for key, values in request_totals.items()}
+        latency = {endpoint: list(buckets) for endpoint, buckets in request_latency.items()}
+        background = dict(background_git)
+
+    lines = []
+
+    def family(name, kind, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(f"{sample}{labels} {value:g}" for sample, labels, value in samples)
+
+    for counter, name, help_text in (
+        ("requests", "filemanager_requests_total", "HTTP requests handled."),
+        ("errors", "filemanager_request_errors_total", "HTTP requests answered with a 5xx status."),
+        ("seconds", "filemanager_request_seconds_total", "Wall time spent handling requests."),
+        ("git_processes", "filemanager_git_processes_total", "git subprocesses spawned while handling requests."),
+        ("git_seconds", "filemanager_git_seconds_total", "Time spent in git subprocesses while handling requests."),
+        ("fs_calls", "filemanager_fs_calls_total", "Filesystem calls (scandir/stat) made while handling requests."),
+        ("response_bytes", "filemanager_response_bytes_total", "Response body bytes sent."),
+    ):
+        family(name, "counter", help_text,
+               [(name, prometheus_labels(endpoint=endpoint), values[counter])
+                for endpoint, values in sorted(totals.items())])
+
+    name = "filemanager_request_duration_seconds"
+    samples = []
+    for endpoint, buckets in sorted(latency.items()):
+        bounds = [f"{bound:g}" for bound in LATENCY_BUCKETS] + ["+Inf"]
+        samples.extend((f"{name}_bucket", prometheus_labels(endpoint=endpoint, le=bound), count)
+                       for bound, count in zip(bounds, buckets))
+        samples.append((f"{name}_sum", prometheus_labels(endpoint=endpoint), totals[endpoint]["seconds"]))
+        samples.append((f"{name}_count", prometheus_labels(endpoint=endpoint), buckets[-1]))
+    family(name, "histogram", "Request latency by endpoint.", samples)
+
+    family("filemanager_background_git_processes_total", "counter",
+           "git subprocesses spawned outside requests (prefetch, clone jobs).",
+           [("filemanager_background_git_processes_total", "", background["git_processes"])])
+    family("filemanager_background_git_seconds_total", "counter",
+           "Time spent in git subprocesses outside requests.",
+           [("filemanager_background_git_seconds_total", "", background["git_seconds"])])
+    return "\n".join(lines) + "\n"
+
+
+class GitOperation(BaseModel):
+    op: str                                  # add / restore_staged / undo_modify / remove_cached / remove / move
+    file_path: str
+    new_file_path: Optional[str] = None      # move only
+
+
 class FileItem(BaseModel):
     key: Optional[int] = None
     name: Optional[str] = None
@@ -49,23 +280,689 @@ class FileItem(BaseModel):
     old_file_path : Optional[str] = None
     new_file_path : Optional[str] = None
     commit_message: Optional[str] = None
+    operations: Optional[list[GitOperation]] = None
     
     branch_name: Optional[str] = None
     old_branch_name: Optional[str] = None
     new_branch_name: Optional[str] = None
+    branch_names: Optional[list[str]] = None
+    include_remotes: Optional[bool] = None
     commit_checksum: Optional[str] = None
+    base_checksum: Optional[str] = None
+    page_size: Optional[int] = None
+    offset: Optional[int] = None
+    cursor: Optional[str] = None
+    stream: Optional[bool] = None
+    query: Optional[str] = None
+    regex: Optional[bool] = None
+    case_sensitive: Optional[bool] = None
+    context_lines: Optional[int] = None
+    limit: Optional[int] = None
     remote_path : Optional[str] = None
     repo_type : Optional[str] = None
     access_token : Optional[str] = None
+    depth: Optional[int] = None
+    clone_filter: Optional[str] = None
+    single_branch: Optional[bool] = None
+    job_id: Optional[str] = None
+
+
+# Repo handle pool
+# 요청마다 Repo를 새로 열지 않고 저장소별로 열린 Repo를 재사용한다.
+REPO_POOL_SIZE = 16
+REPO_IDLE_TIMEOUT = 300  # seconds
+REPO_PATH_CACHE_SIZE = 4096
+
+repo_pool = OrderedDict()   # toplevel -> PooledRepo (LRU order)
+repo_toplevels = {}         # (requested path, search_parent_directories) -> toplevel
+repo_locks = {}             # toplevel -> RLock, kept across handle invalidation
+repo_pool_lock = threading.Lock()
+
+
+class PooledRepo:
+    def __init__(self, repo: Repo, toplevel: str):
+        self.repo = repo
+        self.toplevel = toplevel
+        self.signature = repo_signature(repo.git_dir)
+        self.last_used = time.monotonic()
+
+
+def repo_signature(git_dir: str) -> tuple:
+    """Stat .git/HEAD and .git/index; a change in either invalidates the handle."""
+    signature = []
+    count_fs_calls(2)
+    for name in ("HEAD", "index"):
+        try:
+            st = os.stat(os.path.join(git_dir, name))
+            signature.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def close_repo(repo: Repo, toplevel: str):
+    # Only close handles nobody is using; busy ones are left to the garbage collector.
+    lock = repo_locks.get(toplevel)
+    if lock is not None and lock.acquire(blocking=False):
+        try:
+            repo.close()
+        finally:
+            lock.release()
+
+
+def get_repo(path: str, search_parent_directories: bool = False) -> Repo:
+    """Return a warm Repo for `path`, opening it the same way `Repo(path)` would.
+
+    Raises the same errors as `Repo` (InvalidGitRepositoryError, NoSuchPathError).
+    """
+    key = (os.path.realpath(path), search_parent_directories)
+    now = time.monotonic()
+    stale = []
+
+    with repo_pool_lock:
+        # Evict idle handles
+        for toplevel, pooled in list(repo_pool.items()):
+            if now - pooled.last_used > REPO_IDLE_TIMEOUT:
+                stale.append(repo_pool.pop(toplevel))
+
+        toplevel = repo_toplevels.get(key)
+        pooled = repo_pool.get(toplevel) if toplevel else None
+        if pooled is not None and pooled.signature != repo_signature(pooled.repo.git_dir):
+            stale.append(repo_pool.pop(toplevel))
+            pooled = None
+
+        if pooled is not None:
+            pooled.last_used = now
+            repo_pool.move_to_end(toplevel)
+
+    if pooled is None:
+        repo = InstrumentedRepo(path, search_parent_directories=search_parent_directories)
+        toplevel = os.path.realpath(repo.working_tree_dir or repo.git_dir)
+
+        with repo_pool_lock:
+            if len(repo_toplevels) >= REPO_PATH_CACHE_SIZE:
+                repo_toplevels.clear()
+            repo_toplevels[key] = toplevel
+            repo_locks.setdefault(toplevel, threading.RLock())
+            current = repo_pool.get(toplevel)
+            if current is not None and current.signature == repo_signature(current.repo.git_dir):
+                # Another request opened the same repository under a different path
+                stale.append(PooledRepo(repo, toplevel))
+                pooled = current
+                pooled.last_used = now
+                repo_pool.move_to_end(toplevel)
+            else:
+                if current is not None:
+                    stale.append(current)
+                pooled = PooledRepo(repo, toplevel)
+                repo_pool[toplevel] = pooled
+
+            while len(repo_pool) > REPO_POOL_SIZE:
+                stale.append(repo_pool.popitem(last=False)[1])
+
+    for old in stale:
+        close_repo(old.repo, old.toplevel)
+
+    return pooled.repo
+
+
+def forget_repo_paths():
+    # A new repository may now own paths that used to resolve to a parent repository.
+    with repo_pool_lock:
+        repo_toplevels.clear()
+
+
+def get_toplevel_lock(toplevel: str) -> threading.RLock:
+    with repo_pool_lock:
+        return repo_locks.setdefault(toplevel, threading.RLock())
+
+
+def get_repo_lock(repo: Repo) -> threading.RLock:
+    """Per-repository lock used to serialize git operations on a pooled handle."""
+    return get_toplevel_lock(os.path.realpath(repo.working_tree_dir or repo.git_dir))
+
+
+def repo_scope(repo: Repo, directory: str) -> str:
+    """`directory` relative to the working tree root, "/"-separated ("" for the root).
+
+    Both sides are resolved, because a pooled handle keeps the path it was first
+    opened with, which may be a different alias (symlink, /tmp -> /private/tmp)
+    of the directory being asked about.
+    """
+    scope = os.path.relpath(os.path.realpath(directory), os.path.realpath(repo.working_tree_dir)).replace("\\", "/")
+    return "" if scope == "." else scope
+
+
+# Git executors
+# 블로킹 git / 파일시스템 작업은 이벤트 루프 밖의 전용 스레드 풀에서 실행한다.
+GIT_LOCAL_WORKERS = 8       # short local queries (status, log, branch ...)
+GIT_NETWORK_WORKERS = 2     # long-running network operations (clone, GitHub API)
+
+local_executor = ThreadPoolExecutor(max_workers=GIT_LOCAL_WORKERS, thread_name_prefix="git-local")
+network_executor = ThreadPoolExecutor(max_workers=GIT_NETWORK_WORKERS, thread_name_prefix="git-network")
+
+
+# 같은 저장소로 가는 요청은 풀에 넣기 전에 이벤트 루프에서 줄을 세운다 (대기 중인 요청이 스레드를 차지하지 않도록).
+repo_queues = weakref.WeakValueDictionary()   # toplevel -> asyncio.Lock
+
+
+def toplevel_for_path(path: str) -> Optional[str]:
+    """Resolved toplevel of the repository at `path`, or None when it isn't one."""
+    if not path or not os.path.isdir(path):
+        return None
+    try:
+        repo = get_repo(path)
+    except (InvalidGitRepositoryError, NoSuchPathError):
+        return None
+    return os.path.realpath(repo.working_tree_dir or repo.git_dir)
+
+
+def offload(executor: ThreadPoolExecutor = local_executor, repo_field: str = None):
+    """Run a blocking endpoint in `executor` instead of on the event loop.
+
+    With `repo_field`, calls for the repository named by that field of the
+    request wait their turn on the event loop and only then take a pool thread,
+    where they hold the repository lock. Operations on one repository are
+    serialized, different repositories are served in parallel, and a burst of
+    requests for a busy repository never ties up more than one pool thread.
+    """
+    def decorator(func):
+        def call(args, kwargs, toplevel):
+            if toplevel is None:
+                return func(*args, **kwargs)
+            with get_toplevel_lock(toplevel):
+                return func(*args, **kwargs)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            context = contextvars.copy_context()
+            if repo_field is None:
+                return await loop.run_in_executor(executor, context.run, call, args, kwargs, None)
+
+            request = next(arg for arg in itertools.chain(args, kwargs.values()) if isinstance(arg, FileItem))
+            toplevel = await loop.run_in_executor(executor, context.run, toplevel_for_path,
+                                                  getattr(request, repo_field))
+            if toplevel is None:
+                return await loop.run_in_executor(executor, context.run, call, args, kwargs, None)
+
+            queue = repo_queues.get(toplevel)
+            if queue is None:
+                queue = repo_queues[toplevel] = asyncio.Lock()
+            await queue.acquire()
+            try:
+                future = loop.run_in_executor(executor, context.run, call, args, kwargs, toplevel)
+            except BaseException:
+                queue.release()
+                raise
+            # released when the work finishes, even if the client has gone away meanwhile
+            future.add_done_callback(lambda _: queue.release())
+            return await future
+
+        return wrapper
+    return decorator
+
+
+# Collation
+# setlocale 은 프로세스 전역이고 thread-safe 하지 않으므로 시작할 때 한 번만 설정한다.
+COLLATION_LOCALES = ("ko_KR.UTF-8", "ko_KR.utf8", "ko_KR", "ko-KR", "Korean_Korea.949", "")
+COLLATION_CACHE_SIZE = 262144
+NATURAL_NUMBER = re.compile(r"\d+")
+NATURAL_NUMBER_WIDTH = 20
+
+
+def init_collation():
+    """Set LC_COLLATE once; return strxfrm, or None when only the C locale is available."""
+    for name in COLLATION_LOCALES:
+        try:
+            current = locale.setlocale(locale.LC_COLLATE, name)
+        except locale.Error:
+            continue
+        if current in ("C", "POSIX") or current.startswith("C."):
+            break
+        return locale.strxfrm
+    # code point order already follows 가나다 order for precomposed Hangul
+    return None
+
+
+collate_text = init_collation()
+
+
+@functools.lru_cache(maxsize=COLLATION_CACHE_SIZE)
+def collation_key(name: str) -> str:
+    """Natural, case-insensitive sort key: "file2" < "file10", "Apple" next to "apple".
+
+    The name is NFC-normalized (macOS returns decomposed Hangul) and casefolded,
+    digit runs are zero-padded so they compare by value, and the result is
+    collated by the locale when one is available. The raw name is appended after
+    a NUL to break ties, which keeps the key a plain string (cheap to compare).
+    """
+    text = NATURAL_NUMBER.sub(lambda m: m.group().rjust(NATURAL_NUMBER_WIDTH, "0"),
+                              unicodedata.normalize("NFC", name).casefold())
+    return (collate_text(text) if collate_text is not None else text) + "\0" + name
 
 
 def sort_key(item: FileItem) -> str:
-    locale.setlocale(locale.LC_COLLATE, 'ko_KR.UTF-8')
-    return locale.strxfrm(item.name)
+    return collation_key(item.name)
+
+
+def add_parent_dirs(dirs: set, file_path: str):
+    """Add every ancestor directory of `file_path` ("a/b/c.txt" -> "a", "a/b")."""
+    parent = file_path.rpartition("/")[0]
+    while parent and parent not in dirs:
+        dirs.add(parent)
+        parent = parent.rpartition("/")[0]
+
+
+def get_status_snapshot(repo: Repo, scope: str = "") -> dict:
+    """Run `git status` and `git ls-files` once and index the result.
+
+    `scope` is a directory relative to the working tree root; only paths
+    below it are examined, so the cost follows the folder being viewed and
+    not the whole repository. Untracked and ignored directories are reported
+    collapsed (`--untracked-files=normal`, `--ignored=matching`); in the
+    matching mode git stops at an ignored directory instead of walking into
+    it, so build outputs and virtualenvs cost one entry each.
+
+    Returns a dict with
+      files:          changed / untracked / ignored file -> git_type
+      dirs:           collapsed untracked / ignored directory -> git_type
+      tracked_dirs:   directories with at least one tracked file below them
+      untracked_dirs: directories with at least one untracked path below them
+    Paths are relative to the working tree root and use "/" separators, so
+    classifying a folder is a set lookup no matter how deep its files are.
+    """
+    files = {}
+    dirs = {}
+    tracked_dirs = set()
+    untracked_dirs = set()
+    # literal: a folder named "x*" or "[a]" must not match its siblings
+    pathspec = ["--", f":(literal){scope}"] if scope else []
+
+    output = repo.git.status("--porcelain", "-z", "--untracked-files=normal", "--ignored=matching", *pathspec)
+    records = iter(output.split("\0"))
+
+    for record in records:
+        if not record:
+            continue
+        x, y, file_path = record[0], record[1], record[3:]
+
+        # renamed / copied entries carry the original path as an extra record
+        if x in "RC" or y in "RC":
+            next(records, None)
+
+        if x == "?" or x == "!":
+            git_type = "untracked" if x == "?" else "ignored"
+            if file_path.endswith("/"):
+                file_path = file_path.rstrip("/")
+                dirs[file_path] = git_type
+            else:
+                files[file_path] = git_type
+            if git_type == "untracked":
+                add_parent_dirs(untracked_dirs, file_path)
+        elif x != " ":
+            files[file_path] = "staged"
+        elif y != " ":
+            files[file_path] = "modified"
+
+    for file_path in repo.git.ls_files("-z", *pathspec).split("\0"):
+        if file_path:
+            add_parent_dirs(tracked_dirs, file_path)
+
+    return {"files": files, "dirs": dirs, "tracked_dirs": tracked_dirs, "untracked_dirs": untracked_dirs}
+
+
+def collapsed_git_type(git_status: dict, path: str):
+    """git_type inherited from a collapsed untracked / ignored ancestor directory, if any."""
+    while path:
+        if path in git_status["dirs"]:
+            return git_status["dirs"][path]
+        path = path.rpartition("/")[0]
+    return None
+
+
+# Directory watcher
+# Linux에서는 inotify로 디렉터리 변경을 감지한다. 다른 OS에서는 available이 False.
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_CLOEXEC = 0o2000000
+
+
+class DirectoryWatcher:
+    """Reference-counted inotify watches on directories.
+
+    Subscribers are called as `callback(directory, name)` from the watcher
+    thread; `name` is the changed entry, "" when the directory itself changed,
+    and `directory` is None when the event queue overflowed (assume everything
+    changed).
+    """
+
+    MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+            IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.paths = {}        # wd -> directory
+        self.watches = {}      # directory -> [wd, refcount]
+        self.callbacks = []
+        self.thread = None
+        self.fd = -1
+        try:
+            self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            self.fd = self.libc.inotify_init1(IN_CLOEXEC)
+        except (OSError, AttributeError):
+            pass
+
+    @property
+    def available(self) -> bool:
+        return self.fd >= 0
+
+    def subscribe(self, callback):
+        with self.lock:
+            self.callbacks.append(callback)
+
+    def unsubscribe(self, callback):
+        with self.lock:
+            if callback in self.callbacks:
+                self.callbacks.remove(callback)
+
+    def watch(self, directory: str) -> bool:
+        """Start (or share) a watch on `directory`; False if it can't be watched."""
+        if not self.available:
+            return False
+        with self.lock:
+            if directory in self.watches:
+                self.watches[directory][1] += 1
+                return True
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+            if wd < 0:
+                # e.g. ENOSPC when fs.inotify.max_user_watches is exhausted
+                return False
+            self.paths[wd] = directory
+            self.watches[directory] = [wd, 1]
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="directory-watcher", daemon=True)
+                self.thread.start()
+        return True
+
+    def unwatch(self, directory: str):
+        with self.lock:
+            watch = self.watches.get(directory)
+            if watch is None:
+                return
+            watch[1] -= 1
+            if watch[1] == 0:
+                del self.watches[directory]
+                self.paths.pop(watch[0], None)
+                self.libc.inotify_rm_watch(self.fd, watch[0])
+
+    def run(self):
+        while True:
+            data = os.read(self.fd, 65536)
+            changes = []
+            offset = 0
+            with self.lock:
+                while offset < len(data):
+                    wd, mask, cookie, length = struct.unpack_from("iIII", data, offset)
+                    name = data[offset + 16:offset + 16 + length].rstrip(b"\0")
+                    offset += 16 + length
+
+                    if mask & IN_Q_OVERFLOW:
+                        changes.append((None, ""))
+                        continue
+                    directory = self.paths.get(wd)
+                    if directory is None:
+                        continue
+                    changes.append((directory, os.fsdecode(name)))
+                    if mask & IN_IGNORED:
+                        # the directory is gone; the kernel already dropped the watch
+                        self.paths.pop(wd, None)
+                        self.watches.pop(directory, None)
+                # subscribers come and go from request threads while events are dispatched
+                callbacks = list(self.callbacks)
+
+            for directory, name in changes:
+                for callback in callbacks:
+                    try:
+                        callback(directory, name)
+                    except Exception:
+                        logging.exception("Directory watcher callback failed")
+
+
+watcher = DirectoryWatcher()
+
+
+# Directory listing cache
+# 디렉터리별로 항목 / 크기 / 수정 시간 / git_type을 메모리에 보관한다.
+# inotify가 있으면 변경 이벤트로만 무효화하고, 없으면 디렉터리와 .git/index, HEAD의 stat으로 검사한다.
+LISTING_CACHE_MAX_ITEMS = 200000
+
+listing_cache = OrderedDict()   # directory -> listing (LRU order)
+listing_cache_items = 0
+listing_scans = []              # scans in progress: {"directory", "git_dir", "stale"}
+listing_cache_lock = threading.Lock()
+
+
+def listing_signature(directory: str, git_dir: str) -> tuple:
+    """Fallback validity check when the listing isn't watched.
+
+    Entry stats catch in-place edits that don't touch the directory mtime;
+    on Windows os.scandir returns them without extra system calls.
+    """
+    with os.scandir(directory) as entries:
+        entry_stats = tuple((entry.name, stat.st_mtime_ns, stat.st_size)
+                            for entry in entries for stat in (entry.stat(),))
+    count_fs_calls(len(entry_stats) + 2)
+    entry_stats = hash(entry_stats)
+    return os.stat(directory).st_mtime_ns, entry_stats, repo_signature(git_dir) if git_dir else None
+
+
+def build_listing(directory: str) -> dict:
+    """Scan `directory` once and classify its entries for the listing cache."""
+    try:
+        repo = get_repo(directory, search_parent_directories=True)
+        scope = repo_scope(repo, directory)
+    except InvalidGitRepositoryError:
+        repo = None
+
+    if repo is not None and (scope == ".git" or scope.startswith(".git/")):
+        # .git 내부는 작업 트리가 아니므로 git_type 없음
+        git_status = None
+        inherited = "null"
+    elif repo is not None:
+        # 요청당 git status 한 번만, 보고 있는 디렉터리로 범위 제한
+        git_status = get_status_snapshot(repo, scope)
+        inherited = collapsed_git_type(git_status, scope)
+
+    items = []
+    subdirs = {}   # subfolder path -> st_mtime_ns shown in last_modified
+
+    with os.scandir(directory) as entries:
+        entries = [entry for entry in entries]
+        entries.sort(key=lambda entry: (not entry.is_dir(), collation_key(entry.name)))
+    count_fs_calls(len(entries) + 1)
+
+    for key, entry in enumerate(entries):
+        file_type = "folder" if entry.is_dir() else "file"
+
+        # Git_Type 인식 (코드 병합 부분) git_folder
+        if repo is None:
+            git_type = "null"
+        elif inherited is not None:
+            # everything inside an untracked / ignored directory shares its type
+            git_type = inherited
+        else:
+            full_path = f"{scope}/{entry.name}" if scope else entry.name
+            if file_type == "file":
+                git_type = git_status["files"].get(full_path, "committed")
+            elif entry.name == ".git":
+                git_type = "null"
+            elif full_path in git_status["tracked_dirs"]:
+                git_type = "tracked"
+            else:
+                # no tracked file anywhere below this folder
+                git_type = git_status["dirs"].get(full_path, "untracked")
+
+        stat = entry.stat()
+        last_modified = datetime.datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
+        if file_type == "folder" and entry.name != ".git":
+            subdirs[entry.path] = stat.st_mtime_ns
+
+        items.append({
+            'key': key,
+            'name': entry.name,
+            'file_type': file_type,
+            'git_type': git_type,
+            'size': stat.st_size,
+            'last_modified': last_modified,
+        })
+
+    return {
+        "items": items,
+        "git_dir": repo.git_dir if repo is not None else None,
+        "subdirs": subdirs,
+    }
+
+
+def subdir_changed(subdirs: dict, path: str) -> bool:
+    """Whether the mtime of subfolder `path` differs from the one in a listing."""
+    try:
+        return os.stat(path).st_mtime_ns != subdirs[path]
+    except OSError:
+        return True
+
+
+def drop_listing(directory: str):
+    """Remove a cached listing and release its watches; caller holds listing_cache_lock."""
+    global listing_cache_items
+    listing = listing_cache.pop(directory, None)
+    if listing is None:
+        return
+    listing_cache_items -= len(listing["items"])
+    for watched in listing["watched"]:
+        watcher.unwatch(watched)
+
+
+def get_listing(directory: str) -> dict:
+    """Return the listing of `directory`, served from memory while it is unchanged."""
+    global listing_cache_items
+
+    with listing_cache_lock:
+        listing = listing_cache.get(directory)
+        if listing is not None and not listing["watched"]:
+            # 감시되지 않는 목록은 stat으로 유효성 검사 (하위 폴더 mtime 포함)
+            if listing["signature"] == listing_signature(directory, listing["git_dir"]):
+                listing_cache.move_to_end(directory)
+                return listing
+            drop_listing(directory)
+            listing = None
+
+    if listing is not None:
+        # The watches don't see a file added or removed inside a subfolder, which
+        # moves that subfolder's mtime (the last_modified column). Subfolders are
+        # stat-ed on every hit instead of watched, so a big folder doesn't use up
+        # the user-wide inotify watch budget.
+        subdirs = listing["subdirs"]
+        count_fs_calls(len(subdirs))
+        changed = any(subdir_changed(subdirs, subdir) for subdir in subdirs)
+        with listing_cache_lock:
+            if listing_cache.get(directory) is listing:
+                if not changed:
+                    listing_cache.move_to_end(directory)
+                    return listing
+                drop_listing(directory)
+
+    try:
+        git_dir = get_repo(directory, search_parent_directories=True).git_dir
+    except InvalidGitRepositoryError:
+        git_dir = None
+
+    # Watch before scanning: a change made while scanning marks the scan stale
+    # instead of slipping in between the scan and the watch.
+    # The directory and the repository's HEAD / index affect the listing;
+    # folder git_types only depend on the index.
+    scan = {"directory": directory, "git_dir": git_dir, "stale": False}
+    watched = []
+    signature = None
+    with listing_cache_lock:
+        listing_scans.append(scan)
+        for target in [directory] + ([git_dir] if git_dir else []):
+            if not watcher.watch(target):
+                for done in watched:
+                    watcher.unwatch(done)
+                watched = []
+                break
+            watched.append(target)
+    if not watched:
+        # 감시할 수 없으면 스캔 전에 stat을 기록해 둔다 (스캔 중 변경은 다음 검사에서 잡힌다)
+        signature = listing_signature(directory, git_dir)
+
+    try:
+        listing = build_listing(directory)
+    except BaseException:
+        with listing_cache_lock:
+            listing_scans.remove(scan)
+            for target in watched:
+                watcher.unwatch(target)
+        raise
+    listing["watched"] = watched
+    listing["signature"] = signature
+
+    with listing_cache_lock:
+        listing_scans.remove(scan)
+        if scan["stale"] or listing["git_dir"] != git_dir or directory in listing_cache:
+            # something changed while scanning; serve the result but don't keep it
+            for target in watched:
+                watcher.unwatch(target)
+            listing["watched"] = []
+            return listing
+
+        listing_cache[directory] = listing
+        listing_cache_items += len(listing["items"])
+        while listing_cache_items > LISTING_CACHE_MAX_ITEMS and len(listing_cache) > 1:
+            drop_listing(next(iter(listing_cache)))
+
+    return listing
+
+
+def invalidate_listings(directory: str, name: str):
+    with listing_cache_lock:
+        for scan in listing_scans:
+            if directory is None or directory == scan["directory"] or \
+                    (directory == scan["git_dir"] and name in ("index", "HEAD")):
+                scan["stale"] = True
+
+        if directory is None:
+            for cached in list(listing_cache):
+                drop_listing(cached)
+            return
+
+        # .git 안에서는 index / HEAD 변경만 의미가 있다
+        if name in ("index", "HEAD"):
+            for cached, listing in list(listing_cache.items()):
+                if listing["git_dir"] == directory:
+                    drop_listing(cached)
+
+        if directory in listing_cache:
+            drop_listing(directory)
+
+
+watcher.subscribe(invalidate_listings)
 
 
 @app.get("/api/root_files", response_model=List[FileItem])
-async def get_files(path: str):
+@offload()
+def get_files(path: str):
     path = unquote(path)
     path = os.path.normpath(path)
 
@@ -92,74 +989,853 @@ async def get_files(path: str):
         if directory != "C:\\":
             folders.append(go_back_item)
 
+        for item in get_listing(directory)["items"]:
+            if item['file_type'] == "folder":
+                folders.append(FileItem(**item))
+            else:
+                files.append(FileItem(**item))
+
+        return folders + files
+    
+    except Exception as e:
+        #logging.error(f"Error occurred: {str(e)}")  # 로깅 레벨을 error로 설정
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+LISTING_SORT_KEYS = {
+    "name": lambda item: collation_key(item['name']),
+    "size": lambda item: (item['size'], collation_key(item['name'])),
+    "mtime": lambda item: (item['last_modified'], collation_key(item['name'])),
+    "git_type": lambda item: (item['git_type'], collation_key(item['name'])),
+}
+
+
+def sorted_listing_items(listing: dict, sort_by: str, descending: bool) -> list:
+    """Entries of a cached listing in the requested order, folders first.
+
+    Each ordering is computed once per cached listing and reused by later pages.
+    """
+    orders = listing.setdefault("orders", {})
+    key = (sort_by, descending)
+    if key not in orders:
+        sort_key_func = LISTING_SORT_KEYS[sort_by]
+        folders = [item for item in listing["items"] if item['file_type'] == "folder"]
+        files = [item for item in listing["items"] if item['file_type'] != "folder"]
+        folders.sort(key=sort_key_func, reverse=descending)
+        files.sort(key=sort_key_func, reverse=descending)
+        orders[key] = folders + files
+    return orders[key]
+
+
+@app.get("/api/root_files_page")
+@offload()
+def get_files_page(path: str, offset: int = 0, limit: int = 200, sort_by: str = "name",
+                   order: str = "asc", prefix: str = ""):
+    """One window of a directory listing, with the total count for virtualized tables.
+
+    Unlike root_files, the ".." entry is not included; folders always come first.
+    """
+    directory = os.path.abspath(os.path.join("/", os.path.normpath(unquote(path))))
+
+    if not os.path.isdir(directory):
+        raise HTTPException(status_code=404, detail="Directory not found")
+    if sort_by not in LISTING_SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"sort_by must be one of {', '.join(LISTING_SORT_KEYS)}")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be asc or desc")
+    if offset < 0 or limit < 1:
+        raise HTTPException(status_code=400, detail="offset must be >= 0 and limit >= 1")
+
+    try:
+        items = sorted_listing_items(get_listing(directory), sort_by, order == "desc")
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if prefix:
+        prefix = prefix.casefold()
+        items = [item for item in items if item['name'].casefold().startswith(prefix)]
+
+    return {
+        "total": len(items),
+        "offset": offset,
+        "limit": limit,
+        "items": items[offset:offset + limit],
+    }
+
+
+# Folder summary
+# 폴더의 재귀 크기 / 파일 수 / git 변경 수를 백그라운드에서 계산한다.
+# 디렉터리마다 자기 파일의 합계와 하위 폴더 목록을 mtime 기준으로 SQLite에 저장해 두므로
+# 다시 방문하면 디렉터리 stat만 하고 끝난다. (디렉터리 mtime을 바꾸지 않는 제자리 수정은 반영되지 않음)
+FOLDER_CACHE_FILE = os.path.join(os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache"),
+                                 "git-filemanager", "folder-cache.sqlite")
+FOLDER_SUMMARY_WORKERS = 4
+FOLDER_CACHE_BATCH = 64      # directories written per transaction, so walks don't block each other
+FOLDER_CACHE_RETRY = 30      # seconds before a thread tries to open the cache again
+
+folder_executor = ThreadPoolExecutor(max_workers=FOLDER_SUMMARY_WORKERS, thread_name_prefix="folder-summary")
+folder_cache_local = threading.local()   # one connection per worker thread
+
+
+def open_folder_cache():
+    """This thread's connection to the folder cache, or None when it can't be used right now."""
+    if getattr(folder_cache_local, "conn", None) is None and \
+            time.monotonic() >= getattr(folder_cache_local, "retry_at", 0):
         try:
-            repo = Repo(directory, search_parent_directories=True)
-            is_git = True
-        except InvalidGitRepositoryError:
-            is_git = False
-
-        with os.scandir(directory) as entries:
-            entries = [entry for entry in entries]
-            entries.sort(key=lambda entry: (not entry.is_dir(), entry.name))
-
-            for key, entry in enumerate(entries):
-                file_type = "folder" if entry.is_dir() else "file"
-                
-            # Git_Type 인식 (코드 병합 부분) git_folder
-                if is_git == True :
-                    if file_type == "file" : 
-                        diff_index = repo.index.diff(None)
-                        diff_staged = repo.index.diff("HEAD")
-                        full_path = os.path.relpath(entry.path, repo.working_tree_dir).replace("\\", "/")
-
-                        #logging.info("{full_path}")
-                        if full_path in repo.untracked_files:
-                            git_type = "untracked"
-                        elif full_path in [d.a_path for d in diff_staged]:
-                            git_type = "staged"
-                        elif full_path in [d.a_path for d in diff_index]:
-                            git_type = "modified"
-                        else:
-                            git_type = "committed"
-                            
-                    if file_type == "folder":
-                        folder_path = entry.path
-                        folder_files = [os.path.join(folder_path, f) for f in os.listdir(folder_path) if os.path.isfile(os.path.join(folder_path, f))]
-                        untracked_folder_files = [f for f in folder_files if os.path.relpath(f, repo.working_tree_dir).replace("\\", "/") in repo.untracked_files]
-                        if len(folder_files) == len(untracked_folder_files):
-                            git_type = "untracked"
-                        else : 
-                            git_type = "tracked"
-
-
-                elif is_git == False and file_type == "folder":
-                    git_type = "null"
-
-                elif is_git == False and file_type == "file" :
-                    git_type = "null"
-                    
-                else:
-                    git_type = "null"
+            os.makedirs(os.path.dirname(FOLDER_CACHE_FILE), exist_ok=True)
+            conn = sqlite3.connect(FOLDER_CACHE_FILE, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS folders ("
+                "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, files INTEGER, subdirs TEXT)"
+            )
+            folder_cache_local.conn = conn
+        except (OSError, sqlite3.Error) as e:
+            # e.g. a passing "database is locked"; walk uncached and try again later
+            logging.warning(f"Folder cache unavailable: {e}")
+            folder_cache_local.retry_at = time.monotonic() + FOLDER_CACHE_RETRY
+    return getattr(folder_cache_local, "conn", None)
+
+
+def folder_own_stats(conn, path: str):
+    """(size, file count, sub-folder names) of the files directly in `path`, from the cache
+    while the directory mtime is unchanged. None if the directory can't be read."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    count_fs_calls()
 
-                directory = os.path.abspath(os.path.join("/", path))
+    previous = None
+    if conn is not None:
+        try:
+            row = conn.execute("SELECT mtime_ns, size, files, subdirs FROM folders WHERE path = ?", (path,)).fetchone()
+        except sqlite3.Error:
+            row = None
+        if row is not None:
+            if row[0] == mtime_ns:
+                return row[1], row[2], json.loads(row[3])
+            previous = json.loads(row[3])
+
+    size = files = 0
+    subdirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                count_fs_calls()
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                elif entry.is_file(follow_symlinks=False):
+                    size += entry.stat(follow_symlinks=False).st_size
+                    files += 1
+    except OSError:
+        return None
+
+    if conn is not None:
+        try:
+            conn.execute("INSERT OR REPLACE INTO folders VALUES (?, ?, ?, ?, ?)",
+                         (path, mtime_ns, size, files, json.dumps(subdirs)))
+            # forget folders that were removed or renamed away
+            for name in set(previous or ()) - set(subdirs):
+                removed = os.path.join(path, name)
+                conn.execute("DELETE FROM folders WHERE path = ? OR (path > ? AND path < ?)",
+                             (removed, removed + os.sep, removed + chr(ord(os.sep) + 1)))
+        except sqlite3.Error as e:
+            # the cache is only an optimization; the freshly computed stats are still good
+            drop_folder_cache(conn, e)
+    return size, files, subdirs
+
+
+def commit_folder_cache(conn):
+    try:
+        conn.commit()
+    except sqlite3.Error as e:
+        drop_folder_cache(conn, e)
 
 
-                file_size = entry.stat().st_size
-                last_modified = datetime.datetime.fromtimestamp(
-                    entry.stat().st_mtime).strftime("%Y-%m-%d %H:%M:%S")
+def drop_folder_cache(conn, error: Exception):
+    """Give up this thread's connection after an error (e.g. "database is locked"
+    past the busy timeout); walks continue uncached until it is reopened."""
+    logging.info(f"Folder cache disabled for {FOLDER_CACHE_RETRY}s: {error}")
+    try:
+        conn.rollback()
+        conn.close()
+    except sqlite3.Error:
+        pass
+    folder_cache_local.conn = None
+    folder_cache_local.retry_at = time.monotonic() + FOLDER_CACHE_RETRY
+
+
+def folder_totals(root: str, cancel: threading.Event) -> dict:
+    """{directory: (size, files, folders)} for `root` and every directory below it.
+
+    Directories are visited in pre-order, so walking the visit order backwards
+    sees every child before its parent and totals add up in one pass.
+    """
+    conn = open_folder_cache()
+    own = {}
+    order = []
+    stack = [root]
+    try:
+        while stack and not cancel.is_set():
+            path = stack.pop()
+            stats = folder_own_stats(conn, path)
+            if stats is None:
+                continue
+            own[path] = stats
+            order.append(path)
+            stack.extend(os.path.join(path, name) for name in stats[2])
+            if conn is not None and folder_cache_local.conn is not conn:
+                conn = None   # dropped after an error
+            # short write transactions: other walks only wait for one batch
+            if conn is not None and len(order) % FOLDER_CACHE_BATCH == 0:
+                commit_folder_cache(conn)
+    finally:
+        if conn is not None and folder_cache_local.conn is conn:
+            commit_folder_cache(conn)
+
+    totals = {}
+    for path in reversed(order):
+        size, files, subdirs = own[path]
+        folders = 0
+        for name in subdirs:
+            child = totals.get(os.path.join(path, name))
+            if child is not None:
+                size += child[0]
+                files += child[1]
+                folders += child[2] + 1
+        totals[path] = (size, files, folders)
+    return totals
+
+
+def folder_git_counts(directory: str):
+    """Per sub-folder counts of modified / staged / untracked files from one scoped `git status`.
+
+    Returns None outside a working tree. Collapsed untracked directories are kept
+    as paths so their files can be counted from the size walk.
+    """
+    try:
+        repo = get_repo(directory, search_parent_directories=True)
+    except (InvalidGitRepositoryError, NoSuchPathError):
+        return None
+    if repo.working_tree_dir is None:
+        return None
+    scope = repo_scope(repo, directory)
+    if scope == ".git" or scope.startswith(".git/"):
+        return None
+
+    with get_repo_lock(repo):
+        git_status = get_status_snapshot(repo, scope)
+
+    children = {}
+
+    def child_counts(path):
+        relative = path[len(scope) + 1:] if scope else path
+        if "/" not in relative:
+            return None, relative   # a file directly in `directory`
+        name = relative.split("/", 1)[0]
+        return children.setdefault(name, {"modified": 0, "staged": 0, "untracked": 0, "untracked_dirs": []}), relative
+
+    for file_path, git_type in git_status["files"].items():
+        counts, _ = child_counts(file_path)
+        if counts is not None and git_type in ("modified", "staged", "untracked"):
+            counts[git_type] += 1
+    for dir_path, git_type in git_status["dirs"].items():
+        if git_type != "untracked":
+            continue
+        counts, relative = child_counts(dir_path + "/")
+        if counts is not None:
+            counts["untracked_dirs"].append(relative.rstrip("/"))
+
+    return {"inherited": collapsed_git_type(git_status, scope), "children": children}
+
+
+def summarize_folder(directory: str, name: str, git_counts, cancel: threading.Event) -> dict:
+    path = os.path.join(directory, name)
+    totals = folder_totals(path, cancel)
+    size, files, folders = totals.get(path, (0, 0, 0))
+    item = {'name': name, 'size': size, 'file_count': files, 'folder_count': folders,
+            'modified': None, 'staged': None, 'untracked': None}
+
+    if git_counts is not None and name != ".git":
+        if git_counts["inherited"] is not None:
+            # everything below a collapsed untracked / ignored folder shares its type
+            untracked = files if git_counts["inherited"] == "untracked" else 0
+            item.update(modified=0, staged=0, untracked=untracked)
+        else:
+            counts = git_counts["children"].get(name, {"modified": 0, "staged": 0, "untracked": 0, "untracked_dirs": []})
+            untracked = counts["untracked"] + sum(
+                totals.get(os.path.join(directory, *relative.split("/")), (0, 0, 0))[1]
+                for relative in counts["untracked_dirs"])
+            item.update(modified=counts["modified"], staged=counts["staged"], untracked=untracked)
+    return item
+
+
+@app.get("/api/folder_summary")
+async def folder_summary(path: str):
+    """Recursive size, file / folder counts and modified / staged / untracked counts of
+    every sub-folder of `path`, streamed as NDJSON one folder at a time.
+
+    Folders are computed in parallel and each line is sent as soon as its folder is
+    done, so cached folders show up first.
+    """
+    directory = os.path.abspath(os.path.join("/", os.path.normpath(unquote(path))))
+    if not os.path.isdir(directory):
+        raise HTTPException(status_code=404, detail="Directory not found")
 
-                item = FileItem(key=key, name=entry.name, file_type=file_type,git_type=git_type, size=file_size, last_modified=last_modified)
-                
-                if file_type == "folder":
-                    folders.append(item)
-                else:
-                    files.append(item)
+    loop = asyncio.get_running_loop()
+    try:
+        listing = await loop.run_in_executor(local_executor, contextvars.copy_context().run, get_listing, directory)
+        git_counts = await loop.run_in_executor(
+            local_executor, contextvars.copy_context().run, folder_git_counts, directory)
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except GitCommandError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    names = [item['name'] for item in listing["items"] if item['file_type'] == "folder"]
 
-        return folders + files
-    
+    async def results():
+        cancel = threading.Event()
+        futures = [loop.run_in_executor(folder_executor, contextvars.copy_context().run,
+                                        summarize_folder, directory, name, git_counts, cancel)
+                   for name in names]
+        try:
+            for future in asyncio.as_completed(futures):
+                yield json.dumps(await future, ensure_ascii=False) + "\n"
+        finally:
+            # client went away: stop walking
+            cancel.set()
+            for future in futures:
+                future.cancel()
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+# File search
+# 저장소 안에서는 git ls-files 로 만든 경로 목록을 캐시해 두고 검색하고,
+# 저장소 밖에서는 디렉터리를 병렬로 scandir 하면서 찾는다. 결과는 찾는 대로 NDJSON으로 보낸다.
+SEARCH_MODES = ("substring", "glob", "fuzzy")
+SEARCH_LIMIT_MAX = 5000
+SEARCH_WORKERS = 4
+PATH_INDEX_CACHE_SIZE = 4
+UNTRACKED_INDEX_TTL = 10   # seconds; untracked files don't touch .git/index
+
+search_executor = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="search")
+path_indexes = OrderedDict()   # git dir -> {"signature", "tracked", "untracked", "untracked_at"}
+path_indexes_lock = threading.Lock()
+
+
+class PathList:
+    """Repository-relative paths with casefolded copies, files first, then folders."""
+
+    def __init__(self, files: list, dirs: set):
+        self.dirs = dirs
+        self.paths = files + sorted(dirs)
+        self.file_count = len(files)
+        self.lowered = [path.casefold() for path in self.paths]
+        self.names = [path.rpartition("/")[2] for path in self.lowered]
+
+
+def read_path_list(repo: Repo, *options, known_dirs: set = frozenset()) -> PathList:
+    files = [path for path in repo.git.ls_files("-z", *options).split("\0") if path]
+    dirs = set()
+    for path in files:
+        add_parent_dirs(dirs, path)
+    return PathList(files, dirs - known_dirs)
+
+
+def get_path_index(repo: Repo) -> dict:
+    """Cached path lists of `repo`: tracked paths are re-read when .git/index or HEAD
+    changes, untracked ones at most every UNTRACKED_INDEX_TTL seconds."""
+    signature = repo_signature(repo.git_dir)
+    now = time.monotonic()
+    with path_indexes_lock:
+        index = path_indexes.get(repo.git_dir)
+        if index is None or index["signature"] != signature:
+            index = {"signature": signature, "tracked": read_path_list(repo), "untracked": None, "untracked_at": 0}
+            path_indexes[repo.git_dir] = index
+            while len(path_indexes) > PATH_INDEX_CACHE_SIZE:
+                path_indexes.popitem(last=False)
+        path_indexes.move_to_end(repo.git_dir)
+        if index["untracked"] is None or now - index["untracked_at"] > UNTRACKED_INDEX_TTL:
+            index["untracked"] = read_path_list(repo, "--others", "--exclude-standard",
+                                                known_dirs=index["tracked"].dirs)
+            index["untracked_at"] = now
+        return index
+
+
+def compile_search(query: str, mode: str):
+    """match(relative path, name) -> score or None; both arguments are casefolded.
+
+    A query containing "/" is matched against the path relative to the searched
+    folder, otherwise against the name. Fuzzy matches are scored by how tightly the
+    query's characters cluster, with a bonus when they all fall in the name.
+    """
+    query = query.casefold()
+    on_path = "/" in query
+
+    if mode == "substring":
+        if on_path:
+            return lambda path, name: 1.0 if query in path else None
+        return lambda path, name: 1.0 if query in name else None
+
+    if mode == "glob":
+        pattern = re.compile(fnmatch.translate(query))
+        if on_path:
+            return lambda path, name: 1.0 if pattern.match(path) else None
+        return lambda path, name: 1.0 if pattern.match(name) else None
+
+    query = "".join(query.split())
+    pattern = re.compile(".*?".join(map(re.escape, query)))
+
+    def fuzzy(path, name):
+        if not on_path:
+            m = pattern.search(name)
+            if m:
+                return round(2 + len(query) / (m.end() - m.start()), 4)
+        m = pattern.search(path)
+        if m:
+            return round(len(query) / (m.end() - m.start()), 4)
+        return None
+
+    return fuzzy
+
+
+def search_repository(repo: Repo, scope: str, base: str, match, emit, cancel: threading.Event,
+                      relative_to: str = ""):
+    """Match the cached tracked and untracked paths of `repo` below `scope`.
+
+    Results are emitted below `base`, the path `scope` was requested as.
+    `relative_to` is the repository's own path relative to the searched folder,
+    when the repository was found while walking.
+    """
+    index = get_path_index(repo)
+    prefix = scope + "/" if scope else ""
+    for path_list in (index["tracked"], index["untracked"]):
+        for i, (path, lowered, name) in enumerate(zip(path_list.paths, path_list.lowered, path_list.names)):
+            if i % 4096 == 0 and cancel.is_set():
+                return
+            if prefix:
+                if not path.startswith(prefix):
+                    continue
+                path = path[len(prefix):]
+                lowered = lowered[len(prefix):]
+            score = match(relative_to + lowered, name)
+            if score is not None:
+                file_type = "file" if i < path_list.file_count else "folder"
+                if not emit(os.path.join(base, *path.split("/")), file_type, score):
+                    return
+
+
+def search_tree(root: str, match, emit, cancel: threading.Event):
+    """Breadth-first parallel scandir of `root`; repositories found on the way are
+    searched through their path index instead of being walked."""
+    def scan(directory):
+        if cancel.is_set():
+            return []
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                entries = list(entries)
+        except OSError:
+            return []
+        count_fs_calls(len(entries) + 1)
+        if directory != root and any(entry.name == ".git" for entry in entries):
+            try:
+                relative = os.path.relpath(directory, root).replace(os.sep, "/").casefold() + "/"
+                search_repository(get_repo(directory), "", directory, match, emit, cancel, relative)
+                return []
+            except (InvalidGitRepositoryError, NoSuchPathError, GitCommandError):
+                pass
+        for entry in entries:
+            if entry.name == ".git":
+                continue
+            is_dir = entry.is_dir(follow_symlinks=False)
+            relative = os.path.relpath(entry.path, root).replace(os.sep, "/").casefold()
+            score = match(relative, entry.name.casefold())
+            if score is not None and not emit(entry.path, "folder" if is_dir else "file", score):
+                return []
+            if is_dir:
+                subdirs.append(entry.path)
+        return subdirs
+
+    level = [root]
+    while level and not cancel.is_set():
+        level = [subdir for subdirs in search_executor.map(scan, level) for subdir in subdirs]
+
+
+def run_search(directory: str, match, emit, cancel: threading.Event):
+    try:
+        repo = get_repo(directory, search_parent_directories=True)
+    except (InvalidGitRepositoryError, NoSuchPathError):
+        repo = None
+
+    if repo is not None and repo.working_tree_dir is not None:
+        scope = repo_scope(repo, directory)
+        if scope != ".git" and not scope.startswith(".git/"):
+            search_repository(repo, scope, directory, match, emit, cancel)
+            return
+    search_tree(directory, match, emit, cancel)
+
+
+@app.get("/api/file_search")
+async def file_search(path: str, query: str, mode: str = "substring", limit: int = 200):
+    """Find files and folders below `path` whose name (or relative path, when the query
+    contains "/") matches `query`, streamed as NDJSON while the search runs.
+
+    The last line is {"done": true, "count": n, "truncated": bool}. Closing the
+    connection cancels the search.
+    """
+    directory = os.path.abspath(os.path.join("/", os.path.normpath(unquote(path))))
+    if not os.path.isdir(directory):
+        raise HTTPException(status_code=404, detail="Directory not found")
+    if not query.strip():
+        raise HTTPException(status_code=400, detail="Query is required")
+    if mode not in SEARCH_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(SEARCH_MODES)}")
+    if not 1 <= limit <= SEARCH_LIMIT_MAX:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {SEARCH_LIMIT_MAX}")
+
+    loop = asyncio.get_running_loop()
+    match = compile_search(query, mode)
+
+    async def results():
+        queue = asyncio.Queue()
+        cancel = threading.Event()
+        state = {"count": 0, "truncated": False}
+        state_lock = threading.Lock()
+
+        def emit(found_path, file_type, score):
+            with state_lock:
+                if state["count"] >= limit:
+                    state["truncated"] = True
+                    cancel.set()
+                    return False
+                state["count"] += 1
+            item = {'path': found_path, 'name': os.path.basename(found_path), 'file_type': file_type}
+            if mode == "fuzzy":
+                item['score'] = score
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+            return True
+
+        future = loop.run_in_executor(local_executor, contextvars.copy_context().run,
+                                      run_search, directory, match, emit, cancel)
+        future.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:   # queued after every result of the search
+                    break
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+            if future.exception() is not None:
+                yield json.dumps({"error": str(future.exception())}, ensure_ascii=False) + "\n"
+            yield json.dumps({"done": True, "count": state["count"], "truncated": state["truncated"]}) + "\n"
+        finally:
+            cancel.set()
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+# Content search
+# 저장소는 git grep (작업 트리 또는 특정 커밋), 저장소 밖은 스레드로 파일을 읽어 찾는다.
+# 결과 수 / 시간 제한을 넘기면 git 프로세스를 종료하고 마지막 줄에 표시한다.
+GREP_TIMEOUT = 30            # seconds
+GREP_LIMIT_DEFAULT = 500
+GREP_LIMIT_MAX = 10000
+GREP_CONTEXT_MAX = 10
+GREP_MAX_LINE = 500          # characters kept from a matching / context line
+GREP_MAX_FILE_SIZE = 4 * 1024 * 1024
+GREP_SCAN_BATCH = 32
+
+
+def grep_line(text: str) -> str:
+    return text if len(text) <= GREP_MAX_LINE else text[:GREP_MAX_LINE] + "\u2026"
+
+
+def parse_git_grep(lines, prefix_len: int, context: int):
+    """Group `git grep --null -n --column` output into matches with context.
+
+    Match lines carry a column (path, line, column, text) and context lines don't
+    (path, line, text); "--" separates non-adjacent blocks. A match is yielded
+    once its trailing context is complete.
+    """
+    pending = []
+    before = deque(maxlen=context)
+    current = None
+    for raw in lines:
+        line = raw.decode("utf-8", errors="replace").rstrip("\n")
+        if line == "--":
+            yield from pending
+            pending = []
+            before.clear()
+            continue
+        parts = line.split("\0", 3)
+        if len(parts) < 3:
+            continue
+        path = parts[0][prefix_len:]
+        if path != current:
+            yield from pending
+            pending = []
+            before.clear()
+            current = path
+
+        text = grep_line(parts[-1])
+        for item in pending:
+            item['after'].append(text)
+        while pending and len(pending[0]['after']) >= context:
+            yield pending.pop(0)
+
+        if len(parts) == 4:
+            item = {'path': path, 'line': int(parts[1]), 'column': int(parts[2]), 'text': text,
+                    'before': list(before), 'after': []}
+            if context:
+                pending.append(item)
+            else:
+                yield item
+        before.append(text)
+    yield from pending
+
+
+def git_grep(repo: Repo, query: str, rev: str, scope: str, regex: bool, case_sensitive: bool,
+             context: int, limit: int):
+    """NDJSON lines of `git grep` matches, ending with a {"done": ...} summary line."""
+    options = ["--null", "-n", "--column", "-I", "--no-color", "-E" if regex else "-F"]
+    if not case_sensitive:
+        options.append("-i")
+    if context:
+        options.append(f"-C{context}")
+    if rev is None:
+        options.append("--untracked")
+    options += ["-e", query]
+    if rev is not None:
+        options.append(rev)
+    options.append("--")
+    if scope:
+        # literal: a folder named "x*" must not pull in its siblings
+        options.append(f":(literal){scope}")
+
+    proc = repo.git.grep(*options, as_process=True)
+    timed_out = threading.Event()
+
+    def kill():
+        timed_out.set()
+        proc.proc.kill()
+
+    timer = threading.Timer(GREP_TIMEOUT, kill)
+    timer.daemon = True
+    timer.start()
+    count = 0
+    truncated = False
+    try:
+        # with a revision git prints "<rev>:<path>"
+        prefix_len = len(rev) + 1 if rev is not None else 0
+        for item in parse_git_grep(iter(proc.stdout.readline, b""), prefix_len, context):
+            if count >= limit:
+                truncated = True
+                break
+            count += 1
+            yield json.dumps(item, ensure_ascii=False) + "\n"
+
+        if truncated:
+            proc.proc.kill()
+        returncode = proc.proc.wait()
+        timer.cancel()
+        # 0 = matches, 1 = no match; anything else is an error unless we stopped it
+        if returncode not in (0, 1) and not truncated and not timed_out.is_set():
+            error = proc.stderr.read().decode("utf-8", errors="replace").strip()
+            yield json.dumps({"error": error or f"git grep exited with {returncode}"}, ensure_ascii=False) + "\n"
+        yield json.dumps({"done": True, "count": count, "truncated": truncated,
+                          "timed_out": timed_out.is_set()}) + "\n"
+    finally:
+        timer.cancel()
+        if proc.proc.poll() is None:
+            proc.proc.kill()
+            proc.proc.wait()
+
+
+def grep_file(root: str, path: str, pattern, context: int) -> list:
+    """Matches of `pattern` in one file, skipping large and binary files."""
+    try:
+        if os.path.getsize(path) > GREP_MAX_FILE_SIZE:
+            return []
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return []
+    count_fs_calls(2)
+    if b"\0" in data[:BINARY_CHECK_BYTES]:
+        return []
+
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    relative = os.path.relpath(path, root).replace(os.sep, "/")
+    items = []
+    for i, line in enumerate(lines):
+        m = pattern.search(line)
+        if m:
+            items.append({
+                'path': relative,
+                'line': i + 1,
+                'column': len(line[:m.start()].encode("utf-8")) + 1,
+                'text': grep_line(line),
+                'before': [grep_line(text) for text in lines[max(i - context, 0):i]],
+                'after': [grep_line(text) for text in lines[i + 1:i + 1 + context]],
+            })
+    return items
+
+
+def scan_grep(root: str, pattern, context: int, limit: int):
+    """Content search outside repositories: walk `root` and read files on the search pool."""
+    def files():
+        for directory, dirnames, filenames in os.walk(root):
+            dirnames[:] = [name for name in dirnames if name != ".git"]
+            for name in filenames:
+                path = os.path.join(directory, name)
+                if not os.path.islink(path):
+                    yield path
+
+    deadline = time.monotonic() + GREP_TIMEOUT
+    count = 0
+    truncated = timed_out = False
+    paths = files()
+    while not truncated:
+        if time.monotonic() > deadline:
+            timed_out = True
+            break
+        batch = list(itertools.islice(paths, GREP_SCAN_BATCH))
+        if not batch:
+            break
+        for items in search_executor.map(lambda path: grep_file(root, path, pattern, context), batch):
+            for item in items:
+                if count >= limit:
+                    truncated = True
+                    break
+                count += 1
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+            if truncated:
+                break
+    yield json.dumps({"done": True, "count": count, "truncated": truncated, "timed_out": timed_out}) + "\n"
+
+
+@app.post("/api/content_search")
+@offload()
+def content_search(request: FileItem):
+    """Search file contents below `path` (or the whole `git_path` repository), in the working
+    tree or at `commit_checksum`, streamed as NDJSON.
+
+    Each match has its path relative to the repository root (or to `path` outside
+    repositories), line, column, text and `context_lines` of context; the last line
+    is {"done": true, "count", "truncated", "timed_out"}.
+    """
+    directory = request.path or request.git_path
+    if not directory or not os.path.isdir(directory):
+        raise HTTPException(status_code=404, detail="Directory not found")
+    if not request.query:
+        raise HTTPException(status_code=400, detail="Query is required")
+    limit = request.limit or GREP_LIMIT_DEFAULT
+    context = request.context_lines or 0
+    if not 1 <= limit <= GREP_LIMIT_MAX:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {GREP_LIMIT_MAX}")
+    if not 0 <= context <= GREP_CONTEXT_MAX:
+        raise HTTPException(status_code=400, detail=f"context_lines must be between 0 and {GREP_CONTEXT_MAX}")
+
+    try:
+        repo = get_repo(directory, search_parent_directories=True)
+    except (InvalidGitRepositoryError, NoSuchPathError):
+        repo = None
+
+    if repo is not None and repo.working_tree_dir is not None:
+        scope = repo_scope(repo, directory)
+        rev = resolve_commit_sha(repo, request.commit_checksum) if request.commit_checksum else None
+        return StreamingResponse(
+            git_grep(repo, request.query, rev, scope, bool(request.regex), bool(request.case_sensitive), context, limit),
+            media_type="application/x-ndjson")
+
+    if request.commit_checksum:
+        raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
+    try:
+        pattern = re.compile(request.query if request.regex else re.escape(request.query),
+                             0 if request.case_sensitive else re.IGNORECASE)
+    except re.error as e:
+        raise HTTPException(status_code=400, detail=f"Invalid regular expression: {e}")
+    return StreamingResponse(scan_grep(directory, pattern, context, limit), media_type="application/x-ndjson")
+
+
+# Repository prefetch
+# 저장소에 들어오면 Repo 핸들, 상태, 브랜치, 첫 history 페이지를 미리 계산해 둔다.
+PREFETCH_WORKERS = 2
+
+prefetch_executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="git-prefetch")
+prefetch_state = {"directory": None, "toplevel": None, "cancel": threading.Event(), "futures": []}
+prefetch_lock = threading.Lock()
+
+
+def prefetch_step(cancel: threading.Event, repo: Repo, func, *args):
+    if cancel.is_set():
+        return
+    try:
+        with get_repo_lock(repo):
+            if not cancel.is_set():
+                func(*args)
     except Exception as e:
-        #logging.error(f"Error occurred: {str(e)}")  # 로깅 레벨을 error로 설정
-        raise HTTPException(status_code=500, detail=str(e))
+        logging.info(f"Prefetch step {func.__name__} failed: {e}")
+
+
+def prefetch_repository(directory: str, cancel: threading.Event):
+    """Open the repository containing `directory` and fan out the warm-up steps."""
+    if cancel.is_set():
+        return
+    try:
+        repo = get_repo(directory, search_parent_directories=True)
+    except (InvalidGitRepositoryError, NoSuchPathError):
+        return
+
+    with prefetch_lock:
+        if cancel.is_set():
+            return
+        prefetch_state["toplevel"] = os.path.realpath(repo.working_tree_dir or repo.git_dir)
+        # branch tips + history graph + first page of commit metadata, branch ahead/behind counts
+        prefetch_state["futures"].append(
+            prefetch_executor.submit(prefetch_step, cancel, repo, history_page, repo, None, HISTORY_CHUNK_SIZE))
+        prefetch_state["futures"].append(
+            prefetch_executor.submit(prefetch_step, cancel, repo, branch_overview, repo))
+        if os.path.isdir(directory):
+            prefetch_state["futures"].append(
+                prefetch_executor.submit(prefetch_step, cancel, repo, get_listing, directory))
+
+
+def path_within(path: str, root: str) -> bool:
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+def schedule_prefetch(path: str, toplevel: str = None):
+    """Start warming the repository at `path`, cancelling the prefetch of the previous one.
+
+    Navigating inside the repository that is already warm (or being warmed)
+    doesn't restart it. Callers that already resolved the repository pass its
+    `toplevel`, which lets a warm-up that is still resolving be recognized too.
+    """
+    if not path:
+        return
+    directory = os.path.abspath(os.path.join("/", os.path.normpath(unquote(path))))
+    resolved = os.path.realpath(directory)
+    toplevel = os.path.realpath(toplevel) if toplevel else None
+
+    with prefetch_lock:
+        warm = prefetch_state["toplevel"]
+        pending = prefetch_state["directory"]
+        if warm is None and toplevel is not None and pending is not None and path_within(pending, toplevel):
+            # e.g. push_path(subdir) followed by git_root_path(subdir) -> schedule_prefetch(toplevel)
+            warm = toplevel
+        if warm and path_within(resolved, warm) or resolved == pending:
+            return
+
+        prefetch_state["cancel"].set()
+        for future in prefetch_state["futures"]:
+            future.cancel()
+
+        cancel = threading.Event()
+        prefetch_state.update(directory=resolved, toplevel=None, cancel=cancel, futures=[])
+        prefetch_state["futures"].append(prefetch_executor.submit(prefetch_repository, directory, cancel))
 
 
 # push path_stack
@@ -167,6 +1843,7 @@ async def get_files(path: str):
 async def push_path(path: FileItem):
     path_stack.append(path.path)
     logging.info(f"Path_Stack: {path_stack}")   # path_stack에 push 잘 되나 출력.
+    schedule_prefetch(path.path)
     return {"message": "Path pushed successfully"}
 
 
@@ -178,7 +1855,8 @@ async def reset_path_stack():
 
 
 @app.post("/api/init_repo")
-async def init_repo(repo_path: FileItem):
+@offload()
+def init_repo(repo_path: FileItem):
     path_str = repo_path.path
     #logging.info(f"INIT_PATH: {path_str}")
 
@@ -188,9 +1866,10 @@ async def init_repo(repo_path: FileItem):
     try:
         #logging.info(f"try문 로깅: {path_str}")
         # Initialize the directory as a git repository
-        repo = Repo.init(path_str)
+        repo = InstrumentedRepo.init(path_str)
         # Create an empty commit
         repo.index.commit("Initial commit") #Ref 'HEAD' did not resolve to an object 오류 해결
+        forget_repo_paths()
     except GitCommandError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -198,7 +1877,8 @@ async def init_repo(repo_path: FileItem):
 
 # git_add
 @app.post("/api/git_add")
-async def git_add(request: FileItem):
+@offload(repo_field="git_path")
+def git_add(request: FileItem):
     git_path = request.git_path
     file_path = request.file_path
 
@@ -207,7 +1887,7 @@ async def git_add(request: FileItem):
         raise HTTPException(status_code=404, detail="Directory not found")
 
     try:
-        repo = Repo(git_path)
+        repo = get_repo(git_path)
     except InvalidGitRepositoryError:
         raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
 
@@ -222,7 +1902,8 @@ async def git_add(request: FileItem):
 
 # git_restore_staged
 @app.post("/api/git_restore_staged")
-async def git_restore(request: FileItem):
+@offload(repo_field="git_path")
+def git_restore(request: FileItem):
     git_path = request.git_path
     file_path = request.file_path
 
@@ -231,7 +1912,7 @@ async def git_restore(request: FileItem):
         raise HTTPException(status_code=404, detail="Directory not found")
 
     try:
-        repo = Repo(git_path)
+        repo = get_repo(git_path)
     except InvalidGitRepositoryError:
         raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
 
@@ -245,7 +1926,8 @@ async def git_restore(request: FileItem):
 
 #git_undomodify
 @app.post("/api/git_undo_modify")
-async def git_undo_modify(request: FileItem):
+@offload(repo_field="git_path")
+def git_undo_modify(request: FileItem):
     git_path = request.git_path
     file_path = request.file_path
 
@@ -254,7 +1936,7 @@ async def git_undo_modify(request: FileItem):
         raise HTTPException(status_code=404, detail="Directory not found")
 
     try:
-        repo = Repo(git_path)
+        repo = get_repo(git_path)
     except InvalidGitRepositoryError:
         raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
 
@@ -269,7 +1951,8 @@ async def git_undo_modify(request: FileItem):
 
 #git_rm --cached
 @app.post("/api/git_remove_cached")
-async def git_remove(request: FileItem):
+@offload(repo_field="git_path")
+def git_remove(request: FileItem):
     git_path = request.git_path
     file_path = request.file_path
 
@@ -278,7 +1961,7 @@ async def git_remove(request: FileItem):
         raise HTTPException(status_code=404, detail="Directory not found")
 
     try:
-        repo = Repo(git_path)
+        repo = get_repo(git_path)
     except InvalidGitRepositoryError:
         raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
 
@@ -293,7 +1976,8 @@ async def git_remove(request: FileItem):
 
 #git_rm
 @app.post("/api/git_remove")
-async def git_remove(request: FileItem):
+@offload(repo_field="git_path")
+def git_remove(request: FileItem):
     git_path = request.git_path
     file_path = request.file_path
 
@@ -302,7 +1986,7 @@ async def git_remove(request: FileItem):
         raise HTTPException(status_code=404, detail="Directory not found")
 
     try:
-        repo = Repo(git_path)
+        repo = get_repo(git_path)
     except InvalidGitRepositoryError:
         raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
 
@@ -318,7 +2002,8 @@ async def git_remove(request: FileItem):
 
 #git_mv
 @app.post("/api/git_move")
-async def git_rename(request: FileItem):
+@offload(repo_field="git_path")
+def git_rename(request: FileItem):
     git_path = request.git_path
     old_file_path = request.old_file_path
     new_file_path = request.new_file_path
@@ -328,7 +2013,7 @@ async def git_rename(request: FileItem):
         raise HTTPException(status_code=404, detail="Directory not found")
 
     try:
-        repo = Repo(git_path)
+        repo = get_repo(git_path)
     except InvalidGitRepositoryError:
         raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
 
@@ -342,7 +2027,8 @@ async def git_rename(request: FileItem):
 
 #git_commit
 @app.post("/api/git_commit")
-async def git_commit(request: FileItem):
+@offload(repo_field="git_path")
+def git_commit(request: FileItem):
     git_path = request.git_path
     commit_message = request.commit_message
     file_paths = request.file_paths
@@ -352,15 +2038,15 @@ async def git_commit(request: FileItem):
         raise HTTPException(status_code=404, detail="Directory not found")
 
     try:
-        repo = Repo(git_path)
+        repo = get_repo(git_path)
     except InvalidGitRepositoryError:
         raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
 
-    # Add files to staging area
-    for file_path in file_paths:
+    # Add files to staging area (한 번의 git add)
+    if file_paths:
         try:
-            logging.info(f"committed path: {file_path}")
-            repo.git.add(file_path)
+            logging.info(f"committed paths: {file_paths}")
+            run_with_pathspecs(repo, "add", [], file_paths)
         except GitCommandError as e:
             raise HTTPException(status_code=500, detail=str(e))
 
@@ -373,17 +2059,131 @@ async def git_commit(request: FileItem):
     return {"message": "Files committed successfully"}
 
 
+# batch operations
+# 여러 경로에 대한 add / restore / rm / mv 를 가능한 적은 git 실행으로 처리한다.
+BATCH_COMMANDS = {
+    "add": ("add", []),
+    "restore_staged": ("restore", ["--staged"]),
+    "undo_modify": ("restore", []),
+    "remove_cached": ("rm", ["--cached"]),
+    "remove": ("rm", []),
+}
+
+
+def run_with_pathspecs(repo: Repo, command: str, options: list, paths: list):
+    """Run one git command over many paths, passed NUL-separated on stdin."""
+    with tempfile.TemporaryFile() as pathspecs:
+        pathspecs.write(b"\0".join(os.fsencode(path) for path in paths))
+        pathspecs.seek(0)
+        return repo.git.execute(
+            [Git.GIT_PYTHON_GIT_EXECUTABLE, command, *options, "--pathspec-from-file=-", "--pathspec-file-nul"],
+            istream=pathspecs)
+
+
+def run_batch_group(repo: Repo, op: str, operations: list) -> dict:
+    """Apply consecutive operations of one type; returns {index: error or None}."""
+    results = {}
+
+    if op == "move":
+        # git mv a b c dir/ handles every move into the same existing directory at once
+        groups = OrderedDict()
+        for index, operation in operations:
+            target_dir, name = os.path.split(operation.new_file_path or "")
+            if target_dir and name == os.path.basename(operation.file_path) and \
+                    os.path.isdir(os.path.join(repo.working_tree_dir, target_dir)):
+                groups.setdefault(target_dir, []).append((index, operation))
+            else:
+                groups[(index,)] = [(index, operation)]
+
+        for target, group in groups.items():
+            try:
+                if isinstance(target, tuple):
+                    repo.git.mv(group[0][1].file_path, group[0][1].new_file_path)
+                else:
+                    repo.git.mv(*[operation.file_path for _, operation in group], target)
+                results.update((index, None) for index, _ in group)
+            except GitCommandError as e:
+                if len(group) == 1:
+                    results[group[0][0]] = str(e)
+                else:
+                    for index, operation in group:
+                        results.update(run_batch_group(repo, op, [(index, operation)]))
+        return results
+
+    command, options = BATCH_COMMANDS[op]
+    try:
+        run_with_pathspecs(repo, command, options, [operation.file_path for _, operation in operations])
+        results.update((index, None) for index, _ in operations)
+    except GitCommandError as e:
+        if len(operations) == 1:
+            results[operations[0][0]] = str(e)
+        else:
+            # retry one by one to find out which paths failed
+            for index, operation in operations:
+                results.update(run_batch_group(repo, op, [(index, operation)]))
+    return results
+
+
+@app.post("/api/git_batch")
+@offload(repo_field="git_path")
+def git_batch(request: FileItem):
+    git_path = request.git_path
+    operations = request.operations or []
+
+    # Check if the path is a valid directory
+    if not os.path.exists(git_path) or not os.path.isdir(git_path):
+        raise HTTPException(status_code=404, detail="Directory not found")
+
+    try:
+        repo = get_repo(git_path)
+    except InvalidGitRepositoryError:
+        raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
+
+    for operation in operations:
+        if operation.op != "move" and operation.op not in BATCH_COMMANDS:
+            raise HTTPException(status_code=400, detail=f"Unknown operation: {operation.op}")
+        if operation.op == "move" and not operation.new_file_path:
+            raise HTTPException(status_code=400, detail="move requires new_file_path")
+
+    # 순서가 의미 있으므로 연속된 같은 종류의 작업끼리만 묶는다
+    errors = {}
+    indexed = list(enumerate(operations))
+    for op, group in itertools.groupby(indexed, key=lambda pair: pair[1].op):
+        errors.update(run_batch_group(repo, op, list(group)))
+
+    # git_remove와 동일하게 삭제 후 커밋
+    if any(operation.op == "remove" and errors[index] is None for index, operation in indexed):
+        try:
+            repo.index.commit("Remove file from index")
+        except GitCommandError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    results = []
+    for index, operation in indexed:
+        result = {"op": operation.op, "file_path": operation.file_path, "status": "ok" if errors[index] is None else "error"}
+        if operation.new_file_path:
+            result["new_file_path"] = operation.new_file_path
+        if errors[index] is not None:
+            result["detail"] = errors[index]
+        results.append(result)
+
+    return {"results": results}
+
+
 @app.post("/api/get_staged_files")
-async def get_staged_files(repo_path: FileItem):
+@offload(repo_field="path")
+def get_staged_files(repo_path: FileItem):
     path_str = repo_path.path
     logging.info(f"GET_STAGED_FILES_PATH: {path_str}")
 
     try:
-        repo = Repo(path_str)
+        repo = get_repo(path_str)
         staged_files = []
         for item in repo.index.diff("HEAD"):
             file_path = os.path.join(path_str, item.a_path)
+            count_fs_calls()
             if os.path.isfile(file_path):
+                count_fs_calls(2)
                 file_size = os.path.getsize(file_path)
                 last_modified = datetime.datetime.fromtimestamp(
                     os.path.getmtime(file_path)).strftime("%Y-%m-%d %H:%M:%S")
@@ -403,27 +2203,20 @@ async def get_staged_files(repo_path: FileItem):
 
 
 @app.post("/api/git_root_path")
-async def get_git_root_path(item: FileItem):
+@offload()
+def get_git_root_path(item: FileItem):
     try:
-        repo = Repo(item.path, search_parent_directories=True)
+        repo = get_repo(item.path, search_parent_directories=True)
         git_root_path = repo.git.rev_parse("--show-toplevel")
+        schedule_prefetch(git_root_path, repo.working_tree_dir)
         return {"git_root_path": git_root_path}
     except InvalidGitRepositoryError:
         raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
 
-@app.get("/{path:path}", include_in_schema=False)
-async def catch_all(path: str):
-    return FileResponse("frontend/build/index.html")
-
-
-@app.get("/")
-async def read_root():
-    return FileResponse("frontend/build/index.html")
-
-
 # feature 1 : create, checkout, delete, rename
 @app.post("/api/branche_get")
-async def get_branches(request: FileItem):
+@offload(repo_field="git_path")
+def get_branches(request: FileItem):
     git_path = request.git_path
 
     # Check if the path is a valid directory
@@ -432,7 +2225,7 @@ async def get_branches(request: FileItem):
 
     try:
         # open git repo
-        repo = Repo(git_path)
+        repo = get_repo(git_path)
     except InvalidGitRepositoryError:
         raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
     
@@ -442,7 +2235,8 @@ async def get_branches(request: FileItem):
     return branch_names
 
 @app.post("/api/curbranch_get")
-async def get_branches(request: FileItem):
+@offload(repo_field="git_path")
+def get_current_branch(request: FileItem):
     git_path = request.git_path
 
     # Check if the path is a valid directory
@@ -451,7 +2245,7 @@ async def get_branches(request: FileItem):
 
     try:
         # open git repo
-        repo = Repo(git_path)
+        repo = get_repo(git_path)
     except InvalidGitRepositoryError:
         raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
 
@@ -461,9 +2255,147 @@ async def get_branches(request: FileItem):
     return {"active_branch": active_branch_name}
 
 
+BRANCH_REF_FORMAT = "%(refname)%1f%(objectname)%1f%(HEAD)%1f%(symref)%1f%(upstream:short)%1f" \
+    "%(committerdate:format:%Y-%m-%d %H:%M:%S)%1f%(authorname)%1f%(authoremail)%1f%(contents:subject)"
+AHEAD_BEHIND_CACHE_SIZE = 4096
+ahead_behind_cache = OrderedDict()   # (git dir, HEAD sha, tip sha) -> (ahead, behind)
+ahead_behind_lock = threading.Lock()
+
+
+AHEAD_BEHIND_MERGE_BASE_MAX = 200    # tips passed to merge-base on the command line
+
+
+def count_ahead_behind(repo: Repo, head_sha: str, tip_shas: list) -> dict:
+    """{tip sha: (ahead, behind)} against HEAD for every tip, cached per pair of shas.
+
+    Tips missing from the cache are counted together in one graph walk: a
+    `rev-list --topo-order --parents` over HEAD and all of them lists children
+    before parents, so each commit's set of reaching refs (a bitmask) can be
+    pushed down to its parents as the walk goes. Commits below the common
+    merge base are reachable from every ref and are left out of the walk.
+    """
+    counts = {}
+    missing = []
+    with ahead_behind_lock:
+        for tip in tip_shas:
+            if tip == head_sha:
+                counts[tip] = (0, 0)
+                continue
+            key = (repo.git_dir, head_sha, tip)
+            if key in ahead_behind_cache:
+                ahead_behind_cache.move_to_end(key)
+                counts[tip] = ahead_behind_cache[key]
+            elif tip not in missing:
+                missing.append(tip)
+    if not missing:
+        return counts
+
+    revs = [head_sha] + missing
+    if len(missing) <= AHEAD_BEHIND_MERGE_BASE_MAX:
+        try:
+            revs.append("^" + repo.git.merge_base("--octopus", head_sha, *missing))
+        except GitCommandError:
+            pass   # unrelated histories: walk everything
+
+    with tempfile.TemporaryFile() as stdin:
+        stdin.write("\n".join(revs).encode() + b"\n")
+        stdin.seek(0)
+        output = repo.git.execute(
+            [Git.GIT_PYTHON_GIT_EXECUTABLE, "rev-list", "--topo-order", "--parents", "--stdin"], istream=stdin)
+
+    masks = {head_sha: 1}
+    for i, tip in enumerate(missing):
+        masks[tip] = 2 << i
+    per_mask = {}   # reaching-refs mask -> number of commits
+    for line in output.splitlines():
+        sha, *parents = line.split()
+        mask = masks.pop(sha, 0)
+        per_mask[mask] = per_mask.get(mask, 0) + 1
+        for parent in parents:
+            masks[parent] = masks.get(parent, 0) | mask
+
+    with ahead_behind_lock:
+        for i, tip in enumerate(missing):
+            bit = 2 << i
+            ahead = sum(n for mask, n in per_mask.items() if mask & bit and not mask & 1)
+            behind = sum(n for mask, n in per_mask.items() if mask & 1 and not mask & bit)
+            counts[tip] = ahead_behind_cache[(repo.git_dir, head_sha, tip)] = (ahead, behind)
+        while len(ahead_behind_cache) > AHEAD_BEHIND_CACHE_SIZE:
+            ahead_behind_cache.popitem(last=False)
+    return counts
+
+
+def branch_overview(repo: Repo, include_remotes: bool = False) -> list:
+    """Every local (and optionally remote-tracking) branch with its tip, last commit
+    and ahead/behind counts against HEAD, read with a single `for-each-ref`.
+
+    git 2.41+ counts ahead/behind inside for-each-ref itself; older versions fall back
+    to one batched graph walk over the branches whose tip or HEAD moved.
+    """
+    try:
+        head_sha = repo.head.commit.hexsha
+    except ValueError:
+        head_sha = None   # empty repository
+
+    ref_format = BRANCH_REF_FORMAT
+    native_counts = head_sha is not None and repo.git.version_info >= (2, 41)
+    if native_counts:
+        ref_format += "%1f%(ahead-behind:HEAD)"
+    patterns = ["refs/heads", "refs/remotes"] if include_remotes else ["refs/heads"]
+
+    records = [line.split("\x1f") for line in repo.git.for_each_ref(f"--format={ref_format}", *patterns).splitlines()]
+    records = [fields for fields in records if not fields[3]]   # skip refs/remotes/<remote>/HEAD
+    if head_sha is not None and not native_counts:
+        counts = count_ahead_behind(repo, head_sha, [fields[1] for fields in records])
+
+    branches = []
+    for fields in records:
+        refname, sha, current, symref, upstream, date, author, email, subject = fields[:9]
+        remote = refname.startswith("refs/remotes/")
+        if head_sha is None:
+            ahead = behind = None
+        elif native_counts:
+            ahead, behind = (int(count) for count in fields[9].split())
+        else:
+            ahead, behind = counts[sha]
+        branches.append({
+            'name': refname[len("refs/remotes/" if remote else "refs/heads/"):],
+            'remote': remote,
+            'current': current == "*",
+            'upstream': upstream or None,
+            'commit_checksum': sha,
+            'date': date,
+            'author': author,
+            'email': email.strip("<>"),
+            'subject': subject,
+            'ahead': ahead,
+            'behind': behind,
+        })
+    return branches
+
+
+@app.post("/api/branch_overview")
+@offload(repo_field="git_path")
+def get_branch_overview(request: FileItem):
+    git_path = request.git_path
+
+    # Check if the path is a valid directory
+    if not os.path.exists(git_path) or not os.path.isdir(git_path):
+        raise HTTPException(status_code=404, detail="Directory not found")
+
+    try:
+        # open git repo
+        repo = get_repo(git_path)
+    except InvalidGitRepositoryError:
+        raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
+
+    return branch_overview(repo, bool(request.include_remotes))
+
+
 
 @app.post("/api/branch_create")
-async def branch_create(request: FileItem):
+@offload(repo_field="git_path")
+def branch_create(request: FileItem):
     git_path = request.git_path
     branch_name = request.branch_name
 
@@ -473,7 +2405,7 @@ async def branch_create(request: FileItem):
 
     try:
         # open git repo
-        repo = Repo(git_path)
+        repo = get_repo(git_path)
     except InvalidGitRepositoryError:
         raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
     
@@ -491,7 +2423,8 @@ async def branch_create(request: FileItem):
 
 
 @app.post("/api/branch_delete")
-async def branch_delete(request: FileItem):
+@offload(repo_field="git_path")
+def branch_delete(request: FileItem):
     git_path = request.git_path
     branch_name = request.branch_name
 
@@ -501,7 +2434,7 @@ async def branch_delete(request: FileItem):
 
     try:
         # open git repo
-        repo = Repo(git_path)
+        repo = get_repo(git_path)
     except InvalidGitRepositoryError:
         raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
     
@@ -523,7 +2456,8 @@ async def branch_delete(request: FileItem):
 
 
 @app.post("/api/branch_rename")
-async def branch_rename(request: FileItem):
+@offload(repo_field="git_path")
+def branch_rename(request: FileItem):
     git_path = request.git_path
     old_name = request.old_branch_name
     new_name = request.new_branch_name
@@ -533,7 +2467,7 @@ async def branch_rename(request: FileItem):
         raise HTTPException(status_code=404, detail="Directory not found")
 
     try:
-        repo = Repo(git_path)
+        repo = get_repo(git_path)
     except InvalidGitRepositoryError:
         raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
     
@@ -555,7 +2489,8 @@ async def branch_rename(request: FileItem):
 
 
 @app.post("/api/branch_checkout")
-async def branch_checkout(request: FileItem):
+@offload(repo_field="git_path")
+def branch_checkout(request: FileItem):
     git_path = request.git_path
     branch_name = request.branch_name
 
@@ -564,7 +2499,7 @@ async def branch_checkout(request: FileItem):
         raise HTTPException(status_code=404, detail="Directory not found")
 
     try:
-        repo = Repo(git_path)
+        repo = get_repo(git_path)
     except InvalidGitRepositoryError:
         raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
     
@@ -587,8 +2522,84 @@ async def branch_checkout(request: FileItem):
 
 
 # feature 2 : branch merge
+def merge_preview(repo, branch_name):
+    # merge-tree --write-tree 는 index/working tree 를 건드리지 않고 결과 tree 만 object DB 에 쓴다
+    status, output, error = repo.git.merge_tree(
+        "--write-tree", "--name-only", "-z", "HEAD", branch_name,
+        with_extended_output=True, with_exceptions=False, strip_newline_in_stdout=False)
+    if status not in (0, 1):
+        if "--write-tree" in error or "usage:" in error:
+            raise HTTPException(status_code=501, detail="Merge preview requires git 2.38 or newer")
+        raise HTTPException(status_code=400, detail=error.strip() or "Merge preview failed")
+
+    tokens = output.split("\0")
+    tree = tokens[0].strip()
+    if not tree:
+        # 잘못된 branch 이름 등은 conflict 와 같은 exit code(1)로 끝난다
+        raise HTTPException(status_code=400, detail=error.strip() or "Merge preview failed")
+    conflicts = {}
+    index = 1
+    while index < len(tokens) and tokens[index]:
+        conflicts.setdefault(tokens[index], [])
+        index += 1
+
+    messages = []
+    index += 1
+    while index < len(tokens) and tokens[index].isdigit():
+        count = int(tokens[index])
+        paths = tokens[index + 1:index + 1 + count]
+        kind = tokens[index + 1 + count] if index + 1 + count < len(tokens) else ""
+        message = tokens[index + 2 + count] if index + 2 + count < len(tokens) else ""
+        index += count + 3
+        messages.append({"paths": paths, "type": kind, "message": message.strip()})
+        if kind.startswith("CONFLICT"):
+            conflict_type = kind[len("CONFLICT"):].strip().strip("()")
+            for path in paths:
+                if path in conflicts and conflict_type not in conflicts[path]:
+                    conflicts[path].append(conflict_type)
+
+    return {
+        "branch": branch_name,
+        "clean": status == 0,
+        "tree": tree,
+        "conflicts": [{"path": path, "types": types} for path, types in conflicts.items()],
+        "messages": messages,
+    }
+
+
+@app.post("/api/branch_merge_preview")
+@offload(repo_field="git_path")
+def branch_merge_preview(request: FileItem):
+    git_path = request.git_path
+
+    # Check if the path is a valid directory
+    if not os.path.exists(git_path) or not os.path.isdir(git_path):
+        raise HTTPException(status_code=404, detail="Directory not found")
+
+    try:
+        repo = get_repo(git_path)
+    except InvalidGitRepositoryError:
+        raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
+
+    if request.branch_names is None:
+        if not request.branch_name:
+            raise HTTPException(status_code=400, detail="Branch name is required")
+        return merge_preview(repo, request.branch_name)
+
+    previews = []
+    for branch_name in request.branch_names:
+        try:
+            previews.append(merge_preview(repo, branch_name))
+        except HTTPException as e:
+            if e.status_code == 501:
+                raise
+            previews.append({"branch": branch_name, "error": e.detail})
+    return {"previews": previews}
+
+
 @app.post("/api/branch_merge")
-async def branch_merge(request: FileItem):
+@offload(repo_field="git_path")
+def branch_merge(request: FileItem):
     git_path = request.git_path
     branch_name = request.branch_name   # target
 
@@ -597,7 +2608,7 @@ async def branch_merge(request: FileItem):
         raise HTTPException(status_code=404, detail="Directory not found")
 
     try:
-        repo = Repo(git_path)
+        repo = get_repo(git_path)
     except InvalidGitRepositoryError:
         raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
 
@@ -605,6 +2616,17 @@ async def branch_merge(request: FileItem):
     if repo.is_dirty():
         raise HTTPException(status_code=400, detail="Uncommitted changes exist")
 
+    # 충돌이 예상되면 working tree 를 건드리기 전에 중단
+    try:
+        preview = merge_preview(repo, branch_name)
+    except HTTPException as e:
+        if e.status_code != 501:
+            raise
+        preview = None
+    if preview is not None and not preview["clean"]:
+        unmerged_paths = [conflict["path"] for conflict in preview["conflicts"]]
+        raise HTTPException(status_code=500, detail={"error": "Merge failed", "unmerged_paths": unmerged_paths})
+
     # Try to merge
     try:
         repo.git.merge(branch_name)
@@ -622,37 +2644,251 @@ async def branch_merge(request: FileItem):
 
 
 # feature 3 : git history
+HISTORY_FORMAT = "%H%x1f%P%x1f%an%x1f%ae%x1f%cn%x1f%ad%x1f%B%x1e"
+HISTORY_DATE_FORMAT = "--date=format:%Y-%m-%d %H:%M:%S"
+HISTORY_GRAPH_CACHE_SIZE = 8
+HISTORY_CHUNK_SIZE = 200
+
+history_graphs = OrderedDict()   # (git dir, ref state) -> commit graph of HEAD
+history_graphs_lock = threading.Lock()
+
+
+def ndjson(items):
+    for item in items:
+        yield json.dumps(item, ensure_ascii=False) + "\n"
+
+
+# Commit metadata cache
+# 커밋은 변하지 않으므로 sha 기준으로 .git 아래 SQLite에 저장해두고 무효화하지 않는다.
+COMMIT_CACHE_FILE = "filemanager-cache.sqlite"
+
+
+def open_commit_cache(repo: Repo):
+    """Open the per-repository cache, or return None when it can't be used."""
+    try:
+        conn = sqlite3.connect(os.path.join(repo.common_dir, COMMIT_CACHE_FILE), timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS commits ("
+            "sha TEXT PRIMARY KEY, parents TEXT, author TEXT, email TEXT, "
+            "committer TEXT, date TEXT, message TEXT)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS changed_files (sha TEXT PRIMARY KEY, files TEXT)")
+        conn.execute("CREATE TABLE IF NOT EXISTS diff_stats (sha TEXT PRIMARY KEY, files TEXT)")
+        return conn
+    except sqlite3.Error as e:
+        logging.warning(f"Commit cache unavailable for {repo.common_dir}: {e}")
+        return None
+
+
+def iter_log_records(repo: Repo, *args):
+    """Stream `git log --format=HISTORY_FORMAT` records without buffering the whole output."""
+    proc = repo.git.log(f"--format={HISTORY_FORMAT}", HISTORY_DATE_FORMAT, *args, as_process=True)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer = ""
+    try:
+        while True:
+            chunk = proc.stdout.read(65536)
+            buffer += decoder.decode(chunk, final=not chunk)
+            *records, buffer = buffer.split("\x1e")
+            for record in records:
+                record = record.lstrip("\n")
+                if record:
+                    sha, parents, author, email, committer, date, message = record.split("\x1f", 6)
+                    yield {
+                        'sha': sha,
+                        'parents': parents.split(),
+                        'author': author,
+                        'email': email,
+                        'committer': committer,
+                        'date': date,
+                        'message': message,
+                    }
+            if not chunk:
+                break
+        proc.wait()    # raises GitCommandError on failure
+    finally:
+        # Stop git early when the caller only needed the first page
+        if proc.proc.poll() is None:
+            proc.proc.kill()
+            proc.proc.wait()
+
+
+def get_commit_records(repo: Repo, shas: list) -> dict:
+    """Return {sha: record} for full commit hashes, reading git only for uncached commits."""
+    records = {}
+    conn = open_commit_cache(repo)
+    if conn is None:
+        return {record['sha']: record for record in iter_log_records(repo, "--no-walk=unsorted", *shas, "--")}
+
+    with closing(conn):
+        for offset in range(0, len(shas), 500):
+            chunk = shas[offset:offset + 500]
+            rows = conn.execute(
+                f"SELECT sha, parents, author, email, committer, date, message FROM commits "
+                f"WHERE sha IN ({','.join('?' * len(chunk))})", chunk)
+            for sha, parents, author, email, committer, date, message in rows:
+                records[sha] = {
+                    'sha': sha,
+                    'parents': parents.split(),
+                    'author': author,
+                    'email': email,
+                    'committer': committer,
+                    'date': date,
+                    'message': message,
+                }
+
+        missing = [sha for sha in shas if sha not in records]
+        if missing:
+            ingested = list(iter_log_records(repo, "--no-walk=unsorted", *missing, "--"))
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO commits VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        [(r['sha'], " ".join(r['parents']), r['author'], r['email'],
+                          r['committer'], r['date'], r['message']) for r in ingested])
+            except sqlite3.Error as e:
+                logging.warning(f"Commit cache write failed: {e}")
+            records.update((record['sha'], record) for record in ingested)
+
+    return records
+
+
+def resolve_commit_sha(repo: Repo, rev: str) -> str:
+    try:
+        return repo.git.rev_parse("--verify", "--end-of-options", f"{rev}^{{commit}}")
+    except GitCommandError:
+        raise HTTPException(status_code=404, detail="Commit not found")
+
+
+def read_branch_tips(repo: Repo):
+    """Return branch names and a {sha: bitset} map of their tips; bit 0 is HEAD."""
+    branch_names = []
+    tips = {}
+    for line in repo.git.for_each_ref("--format=%(objectname) %(refname:short)", "refs/heads").splitlines():
+        sha, name = line.split(" ", 1)
+        tips[sha] = tips.get(sha, 0) | (1 << (len(branch_names) + 1))
+        branch_names.append(name)
+
+    head_sha = repo.head.commit.hexsha
+    tips[head_sha] = tips.get(head_sha, 0) | 1    # bit 0 = HEAD
+    return branch_names, tips
+
+
+def history_entry(record: dict, commit_bits: int, branch_names: list) -> dict:
+    return {
+        'commit_checksum': record['sha'],  # string type
+        'parent_checksums': record['parents'],
+        'commit_message': record['message'],
+        'branches': [name for i, name in enumerate(branch_names) if commit_bits >> (i + 1) & 1],
+        'author': record['author'],  # string type
+        'email': record['email']  # string type
+    }
+
+
+def history_graph(repo: Repo, branch_names: list, tips: dict) -> dict:
+    """Commits reachable from HEAD in date order, with their branch bitsets.
+
+    Every branch tip gets one bit; a commit's bitset is propagated to its parents
+    while walking in date order (children always come before their parents), so
+    branch membership costs a single pass over the graph. Only hashes and parents
+    are read (`git rev-list --parents`), and the result is cached until a branch
+    tip or HEAD moves.
+    """
+    key = (repo.git_dir, tuple(branch_names), tuple(tips.items()))
+    with history_graphs_lock:
+        graph = history_graphs.get(key)
+        if graph is not None:
+            history_graphs.move_to_end(key)
+            return graph
+
+    bits = dict(tips)
+    order = []
+    commit_bits = {}
+    for line in repo.git.rev_list("--date-order", "--parents", *tips.keys(), "--").splitlines():
+        sha, *parents = line.split()
+        own_bits = bits.pop(sha, 0)
+        for parent in parents:
+            bits[parent] = bits.get(parent, 0) | own_bits
+        # 기존과 같이 HEAD에서 도달 가능한 커밋만 반환
+        if own_bits & 1:
+            order.append(sha)
+            commit_bits[sha] = own_bits
+
+    graph = {"order": order, "index": {sha: i for i, sha in enumerate(order)}, "bits": commit_bits}
+    with history_graphs_lock:
+        history_graphs[key] = graph
+        while len(history_graphs) > HISTORY_GRAPH_CACHE_SIZE:
+            history_graphs.popitem(last=False)
+    return graph
+
+
+def iter_history(repo: Repo, cursor: str = None):
+    """Return an iterator of history entries reachable from HEAD, newest first.
+
+    Commit metadata comes from the on-disk cache in chunks, so only commits
+    that were never seen before are read from git. With `cursor`, the walk
+    continues after that commit.
+    """
+    if not repo.head.is_valid():
+        return iter(())
+
+    branch_names, tips = read_branch_tips(repo)
+    graph = history_graph(repo, branch_names, tips)
+
+    # cursor는 스트리밍 시작 전에 검사한다
+    start = 0
+    if cursor is not None:
+        if cursor not in graph["index"]:
+            raise HTTPException(status_code=400, detail="Unknown cursor")
+        start = graph["index"][cursor] + 1
+
+    return continue_history(repo, graph, start, branch_names)
+
+
+def continue_history(repo: Repo, graph: dict, start: int, branch_names: list):
+    order = graph["order"]
+    for offset in range(start, len(order), HISTORY_CHUNK_SIZE):
+        chunk = order[offset:offset + HISTORY_CHUNK_SIZE]
+        records = get_commit_records(repo, chunk)
+        for sha in chunk:
+            yield history_entry(records[sha], graph["bits"][sha], branch_names)
+
+
+def history_page(repo: Repo, cursor: str, page_size: int):
+    history = iter_history(repo, cursor)
+    commits = list(itertools.islice(history, page_size + 1))
+    if hasattr(history, "close"):
+        history.close()
+
+    next_cursor = commits[page_size - 1]['commit_checksum'] if len(commits) > page_size else None
+    return commits[:page_size], next_cursor
+
+
 @app.post("/api/git_history")
-async def get_git_history(request: FileItem):
+@offload(repo_field="git_path")
+def get_git_history(request: FileItem):
     git_path = request.git_path
     # branch_name = request.branch_name ( if sorting by selected branch for graph )
 
+    if request.page_size is not None and request.page_size < 1:
+        raise HTTPException(status_code=400, detail="page_size must be positive")
+
     try:
-        repo = Repo(git_path)
-
-        # all branch & creation time
-        commits = list(repo.iter_commits())
-
-        history_list = []
-
-        for commit in commits:
-            # 브랜치 이름 리스트
-            branch_names = [branch.name for branch in repo.branches if commit in repo.iter_commits(branch)]
-            
-            # we may need more information about commit for making history tree
-            commit_info = {
-                'commit_checksum': commit.hexsha,  # string type
-                'parent_checksums': [parent.hexsha for parent in commit.parents],
-                'commit_message': commit.message, 
-                'branches': branch_names,
-                'author': commit.author.name,  # string type
-                'email': commit.author.email  # string type
-                # 'date': datetime.datetime.fromtimestamp(
-                #    commit.authored_datetime).strftime("%Y-%m-%d %H:%M:%S")
-            }
-            history_list.append(commit_info)
-        
-        return history_list
+        repo = get_repo(git_path)
+
+        # NDJSON: 한 줄에 커밋 하나씩, 첫 화면을 먼저 그릴 수 있도록 스트리밍
+        if request.stream:
+            history = iter_history(repo, request.cursor)
+            if request.page_size:
+                history = itertools.islice(history, request.page_size)
+            return StreamingResponse(ndjson(history), media_type="application/x-ndjson")
+
+        if request.page_size or request.cursor:
+            commits, next_cursor = history_page(repo, request.cursor, request.page_size or HISTORY_CHUNK_SIZE)
+            return {"commits": commits, "next_cursor": next_cursor}
+
+        return list(iter_history(repo))
     
     except GitCommandError as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -660,26 +2896,25 @@ async def get_git_history(request: FileItem):
 
 
 @app.post("/api/commit_information")
-async def get_commit_information(request:FileItem):
+@offload(repo_field="git_path")
+def get_commit_information(request:FileItem):
     git_path = request.git_path
 
     try:
-        repo = Repo(git_path)
+        repo = get_repo(git_path)
 
-        try:
-            # 특정 커밋 get
-            commit = repo.commit(request.commit_checksum)
-        except:
-            raise HTTPException(status_code=404, detail="Commit not found")
+        # 특정 커밋 get
+        sha = resolve_commit_sha(repo, request.commit_checksum)
+        commit = get_commit_records(repo, [sha])[sha]
         
         commit_info = {
-            'commit_checksum': commit.hexsha,
-            'parent_checksums': [parent.hexsha for parent in commit.parents],
-            'author': commit.author.name,
-            'commiter': commit.committer.name,
-            'date': commit.authored_datetime.strftime("%Y-%m-%d %H:%M:%S"),
-            'commit_message' : commit.message,
-            'email' : commit.author.email 
+            'commit_checksum': commit['sha'],
+            'parent_checksums': commit['parents'],
+            'author': commit['author'],
+            'commiter': commit['committer'],
+            'date': commit['date'],
+            'commit_message' : commit['message'],
+            'email' : commit['email'] 
         }
 
         return commit_info
@@ -689,17 +2924,23 @@ async def get_commit_information(request:FileItem):
     
 
 @app.post("/api/changed_files")
+@offload(repo_field="git_path")
 def get_changed_files(request: FileItem):
     git_path = request.git_path
 
     try:
-        repo = Repo(git_path)
+        repo = get_repo(git_path)
 
-        try:
-            commit = repo.commit(request.commit_checksum)
-        except:
-            raise HTTPException(status_code=404, detail="Commit not found")
-        
+        sha = resolve_commit_sha(repo, request.commit_checksum)
+
+        conn = open_commit_cache(repo)
+        if conn is not None:
+            with closing(conn):
+                row = conn.execute("SELECT files FROM changed_files WHERE sha = ?", (sha,)).fetchone()
+            if row is not None:
+                return json.loads(row[0])
+
+        commit = repo.commit(sha)
         changed_files = []
 
         if commit.parents:
@@ -725,16 +2966,266 @@ def get_changed_files(request: FileItem):
                     "change_type": "modified"
                 })
 
+        conn = open_commit_cache(repo)
+        if conn is not None:
+            with closing(conn), conn:
+                conn.execute("INSERT OR IGNORE INTO changed_files VALUES (?, ?)",
+                             (sha, json.dumps(changed_files, ensure_ascii=False)))
+
         return changed_files
     
     except GitCommandError as e:
         raise HTTPException(status_code=500, detail=str(e))
     
 
+CHANGE_TYPES = {
+    "A": "added",
+    "D": "deleted",
+    "M": "modified",
+    "R": "renamed",
+    "C": "copied",
+    "T": "type_changed",
+    "U": "unmerged",
+}
+
+
+def read_diff_stats(repo: Repo, sha: str) -> list:
+    """Changed files of a commit against its first parent, with line counts.
+
+    One `git diff-tree -r -z -M -C --raw --numstat` pass: the raw records give
+    change types and rename / copy sources, the numstat records that follow
+    (in the same order) give insertions / deletions, "-" meaning binary.
+    """
+    parents = repo.git.rev_parse(f"{sha}^@").split()
+    revisions = [parents[0], sha] if parents else ["--root", sha]
+    output = repo.git.diff_tree("-r", "-z", "-M", "-C", "--raw", "--numstat", "--no-commit-id", *revisions)
+
+    files = []
+    stats = 0
+    tokens = iter(output.split("\0"))
+    for token in tokens:
+        if not token:
+            continue
+        if token.startswith(":"):
+            status = token.split()[-1]
+            change_type = CHANGE_TYPES.get(status[0], "unknown")
+            old_path = next(tokens) if status[0] in "RC" else None
+            files.append({
+                "path": next(tokens),
+                "old_path": old_path,
+                "change_type": change_type,
+                "similarity": int(status[1:]) if status[1:] else None,
+                "insertions": 0,
+                "deletions": 0,
+                "binary": False,
+            })
+        else:
+            insertions, deletions, path = token.split("\t", 2)
+            if not path:
+                # renames / copies: the paths follow as two separate records
+                next(tokens)
+                next(tokens)
+            entry = files[stats]
+            stats += 1
+            if insertions == "-":
+                entry["binary"] = True
+            else:
+                entry["insertions"] = int(insertions)
+                entry["deletions"] = int(deletions)
+
+    return files
+
+
+@app.post("/api/changed_files_detail")
+@offload(repo_field="git_path")
+def get_changed_files_detail(request: FileItem):
+    """Rename-aware changed files of a commit with full paths and diff stats, paginated."""
+    git_path = request.git_path
+    offset = request.offset or 0
+    page_size = request.page_size or 500
+
+    if offset < 0 or page_size < 1:
+        raise HTTPException(status_code=400, detail="offset must be >= 0 and page_size >= 1")
+
+    try:
+        repo = get_repo(git_path)
+        sha = resolve_commit_sha(repo, request.commit_checksum)
+
+        files = None
+        conn = open_commit_cache(repo)
+        if conn is not None:
+            with closing(conn):
+                row = conn.execute("SELECT files FROM diff_stats WHERE sha = ?", (sha,)).fetchone()
+            if row is not None:
+                files = json.loads(row[0])
+
+        if files is None:
+            files = read_diff_stats(repo, sha)
+            conn = open_commit_cache(repo)
+            if conn is not None:
+                with closing(conn), conn:
+                    conn.execute("INSERT OR IGNORE INTO diff_stats VALUES (?, ?)",
+                                 (sha, json.dumps(files, ensure_ascii=False)))
+
+        return {
+            "commit_checksum": sha,
+            "total": len(files),
+            "insertions": sum(entry["insertions"] for entry in files),
+            "deletions": sum(entry["deletions"] for entry in files),
+            "offset": offset,
+            "files": files[offset:offset + page_size],
+        }
+
+    except GitCommandError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# file diff / blob content
+# 파이프에서 청크 단위로 읽어 스트리밍하므로 큰 파일도 메모리에 올리지 않는다.
+STREAM_CHUNK_SIZE = 65536
+DIFF_MAX_BYTES = 64 * 1024 * 1024      # diffs are cut off after this many bytes
+BLOB_INLINE_LIMIT = 16 * 1024 * 1024   # larger (or binary) blobs need a Range header or raw=true
+BINARY_CHECK_BYTES = 8000              # same heuristic as git: a NUL byte in the first 8000 bytes
+EMPTY_TREE_SHA = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"   # git knows this tree without storing it
+
+
+def stream_process(proc, head: bytes = b"", skip: int = 0, limit: int = None, truncated_marker: bytes = None):
+    """Yield a git process's stdout in chunks, then make sure the process is gone.
+
+    `head` is output already read by the caller; `skip` bytes are discarded
+    first and at most `limit` bytes are produced.
+    """
+    try:
+        pending = head
+        while True:
+            chunk = pending or proc.stdout.read(STREAM_CHUNK_SIZE)
+            pending = b""
+            if not chunk:
+                break
+            if skip:
+                dropped = min(skip, len(chunk))
+                chunk = chunk[dropped:]
+                skip -= dropped
+                if not chunk:
+                    continue
+            if limit is not None:
+                if limit <= 0:
+                    if truncated_marker:
+                        yield truncated_marker
+                    break
+                chunk = chunk[:limit]
+                limit -= len(chunk)
+            yield chunk
+    finally:
+        if proc.proc.poll() is None:
+            proc.proc.kill()
+        proc.proc.wait()
+
+
+def parse_range(header: str, size: int):
+    """Parse a single `bytes=` range; returns (start, end) inclusive or raises 416."""
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", header.strip())
+    if not match or match.groups() == ("", ""):
+        raise HTTPException(status_code=416, detail="Only a single bytes range is supported",
+                            headers={"Content-Range": f"bytes */{size}"})
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # suffix range: the last N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start > end or start >= size:
+        raise HTTPException(status_code=416, detail="Range not satisfiable",
+                            headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+@app.post("/api/file_diff")
+@offload(repo_field="git_path")
+def get_file_diff(request: FileItem):
+    """Unified diff of one file between base_checksum (default: first parent) and commit_checksum."""
+    git_path = request.git_path
+
+    if not request.file_path:
+        raise HTTPException(status_code=400, detail="file_path is required")
+
+    try:
+        repo = get_repo(git_path)
+        sha = resolve_commit_sha(repo, request.commit_checksum)
+
+        if request.base_checksum:
+            base = resolve_commit_sha(repo, request.base_checksum)
+        else:
+            parents = repo.git.rev_parse(f"{sha}^@").split()
+            # root commit: diff against the empty tree
+            base = parents[0] if parents else EMPTY_TREE_SHA
+
+        # include the old path so renames show up as one diff
+        paths = [request.file_path] + ([request.old_file_path] if request.old_file_path else [])
+        proc = repo.git.diff("--no-color", "--no-ext-diff", "-M", base, sha, "--", *paths, as_process=True)
+
+    except GitCommandError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    marker = f"\n... diff truncated after {DIFF_MAX_BYTES} bytes ...\n".encode()
+    return StreamingResponse(stream_process(proc, limit=DIFF_MAX_BYTES, truncated_marker=marker),
+                             media_type="text/plain; charset=utf-8")
+
+
+@app.get("/api/file_blob")
+@offload()
+def get_file_blob(request: Request, git_path: str, file_path: str, revision: str = "HEAD", raw: bool = False):
+    """Content of `file_path` at `revision`, streamed from `git cat-file`, with Range support."""
+    try:
+        repo = get_repo(git_path)
+    except (InvalidGitRepositoryError, NoSuchPathError):
+        raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
+
+    sha = resolve_commit_sha(repo, revision)
+    spec = f"{sha}:{file_path.lstrip('/')}"
+
+    try:
+        if repo.git.cat_file("-t", spec) != "blob":
+            raise HTTPException(status_code=400, detail="Path is not a file")
+        size = int(repo.git.cat_file("-s", spec))
+    except GitCommandError:
+        raise HTTPException(status_code=404, detail="File not found at this revision")
+
+    range_header = request.headers.get("range")
+    start, end = parse_range(range_header, size) if range_header else (0, size - 1)
+
+    proc = repo.git.cat_file("blob", spec, as_process=True)
+    head = proc.stdout.read(BINARY_CHECK_BYTES)
+    binary = b"\0" in head
+
+    if not range_header and not raw and (binary or size > BLOB_INLINE_LIMIT):
+        proc.proc.kill()
+        proc.proc.wait()
+        raise HTTPException(status_code=413, detail={
+            "error": "Blob is binary or too large; request a byte range or raw=true",
+            "size": size,
+            "binary": binary,
+        })
+
+    headers = {"Accept-Ranges": "bytes", "Content-Length": str(max(end - start + 1, 0))}
+    status_code = 200
+    if range_header:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        status_code = 206
+
+    media_type = "application/octet-stream" if binary else \
+        (mimetypes.guess_type(file_path)[0] or "text/plain; charset=utf-8")
+    return StreamingResponse(stream_process(proc, head=head, skip=start, limit=end - start + 1),
+                             status_code=status_code, media_type=media_type, headers=headers)
+
+
 #feature 4 : git clone
 # 링크 받아서 repo check
 @app.post("/api/repo_status")
-async def get_repo_status(request: FileItem):
+@offload(network_executor)
+def get_repo_status(request: FileItem):
     try:
         g = Github(request.access_token)
         repo = g.get_repo(request.remote_path)
@@ -747,7 +3238,8 @@ async def get_repo_status(request: FileItem):
 
 
 @app.post("/api/clone_repo")
-async def clone_repo(request: FileItem):
+@offload(network_executor)
+def clone_repo(request: FileItem):
     path = request.path
     remote_path = request.remote_path
     access_token = request.access_token
@@ -757,9 +3249,694 @@ async def clone_repo(request: FileItem):
         repo_path = urlparse(remote_path).path.lstrip('/')
         repo = github.get_repo(repo_path)
 
-        Repo.clone_from(repo.clone_url, path,  env={'GIT_ASKPASS': 'echo', 'GIT_USERNAME': 'git', 'GIT_PASSWORD': access_token} if access_token else None)
+        InstrumentedRepo.clone_from(repo.clone_url, path,  env=token_auth_env(repo.clone_url, access_token) if access_token else None)
+        forget_repo_paths()
 
         return {"message": "Repository cloned successfully."}
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# Repository change notifications
+# 보고 있는 저장소의 HEAD / index / refs / 작업 디렉터리 변경을 server-sent events로 알린다.
+EVENTS_POLL_INTERVAL = 0.2      # how often the stream checks for pending changes
+EVENTS_FALLBACK_INTERVAL = 2.0  # stat polling interval without inotify
+EVENTS_KEEPALIVE = 15.0
+
+
+class RepoSubscription:
+    """Collects which parts of a repository changed since the last delta was sent."""
+
+    def __init__(self, repo: Repo, directory: str):
+        self.repo = repo
+        self.git_dir = repo.git_dir
+        self.refs_dir = os.path.join(repo.git_dir, "refs", "heads")
+        self.directory = directory
+        self.dirty = set()
+        self.lock = threading.Lock()
+        self.watched = []
+        self.polling = not watcher.available
+        self.head = None
+        self.branches = {}
+        self.files = {}
+
+    def on_change(self, directory: str, name: str):
+        if directory is None:
+            changed = {"head", "refs", "files"}
+        elif directory == self.git_dir:
+            changed = {"HEAD": {"head"}, "index": {"files"}, "packed-refs": {"refs"}}.get(name, set())
+        elif directory == self.refs_dir or directory.startswith(self.refs_dir + os.sep):
+            changed = {"refs"}
+        elif directory == self.directory:
+            changed = {"files"}
+        else:
+            return
+        self.mark_dirty(changed)
+
+    def mark_dirty(self, changed: set):
+        # called from the watcher thread and from the event stream
+        with self.lock:
+            self.dirty |= changed
+
+    def take_dirty(self) -> set:
+        with self.lock:
+            dirty, self.dirty = self.dirty, set()
+        return dirty
+
+    def sync_watches(self):
+        """Watch .git, every directory under refs/heads and the viewed directory."""
+        targets = [self.git_dir]
+        for root, dirnames, _ in os.walk(self.refs_dir):
+            targets.append(root)
+        if self.directory:
+            targets.append(self.directory)
+
+        for target in targets:
+            if target not in self.watched:
+                if watcher.watch(target):
+                    self.watched.append(target)
+                else:
+                    self.polling = True
+
+    def close(self):
+        watcher.unsubscribe(self.on_change)
+        for target in self.watched:
+            watcher.unwatch(target)
+        self.watched = []
+
+    def signature(self) -> tuple:
+        # fallback: stat-based change detection, one entry per dirty flag
+        def stat(path):
+            try:
+                st = os.stat(path)
+                return st.st_mtime_ns, st.st_size
+            except OSError:
+                return None
+
+        refs = tuple((root, stat(root)) for root, _, _ in os.walk(self.refs_dir))
+        files = listing_signature(self.directory, self.git_dir) if self.directory else None
+        return (stat(os.path.join(self.git_dir, "HEAD")),
+                (refs, stat(os.path.join(self.git_dir, "packed-refs"))),
+                files)
+
+    def read_head(self) -> dict:
+        with open(os.path.join(self.git_dir, "HEAD")) as f:
+            head = f.read().strip()
+        branch = head[len("ref: refs/heads/"):] if head.startswith("ref: refs/heads/") else None
+        try:
+            commit = self.repo.git.rev_parse("--verify", "-q", "HEAD")
+        except GitCommandError:
+            commit = None
+        return {"branch": branch, "commit": commit}
+
+    def read_branches(self) -> dict:
+        output = self.repo.git.for_each_ref("--format=%(objectname) %(refname:short)", "refs/heads")
+        return dict(reversed(line.split(" ", 1)) for line in output.splitlines())
+
+    def read_files(self) -> dict:
+        if not self.directory or not os.path.isdir(self.directory):
+            return {}
+        # .git changes on every git command and isn't part of the working tree
+        return {item['name']: item for item in get_listing(self.directory)["items"] if item['name'] != ".git"}
+
+    def collect(self, dirty: set) -> list:
+        """Re-read the dirty parts and return compact delta events."""
+        events = []
+
+        if "head" in dirty:
+            head = self.read_head()
+            if head != self.head:
+                self.head = head
+                events.append({"type": "head", **head})
+
+        if "refs" in dirty:
+            self.sync_watches()
+            branches = self.read_branches()
+            for name in sorted(set(branches) | set(self.branches)):
+                old, new = self.branches.get(name), branches.get(name)
+                if old != new:
+                    events.append({"type": "branch", "name": name, "old": old, "new": new})
+            self.branches = branches
+            # the checked-out branch moving changes the HEAD commit as well
+            head = self.read_head()
+            if head != self.head:
+                self.head = head
+                events.append({"type": "head", **head})
+
+        if "files" in dirty:
+            files = self.read_files()
+            # keys shift when entries come and go, so they don't count as a change
+            changed = [item for name, item in files.items()
+                       if name not in self.files or {**self.files[name], 'key': item['key']} != item]
+            removed = [name for name in self.files if name not in files]
+            self.files = files
+            if changed or removed:
+                events.append({"type": "files", "path": self.directory, "changed": changed, "removed": removed})
+
+        return events
+
+
+@app.get("/api/repo_events")
+async def repo_events(git_path: str, path: str = None):
+    """Server-sent events for a repository (and optionally the directory being viewed).
+
+    The first event is a snapshot; after that only deltas are sent:
+      head   - HEAD switched or the checked-out branch moved
+      branch - a branch was created, deleted or moved (old / new sha)
+      files  - entries of the viewed directory whose git_type, size or mtime changed
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        repo = await loop.run_in_executor(local_executor, contextvars.copy_context().run,
+                                          functools.partial(get_repo, git_path, search_parent_directories=True))
+    except (InvalidGitRepositoryError, NoSuchPathError):
+        raise HTTPException(status_code=400, detail="The directory is not a valid git repository")
+
+    directory = os.path.abspath(os.path.join("/", os.path.normpath(unquote(path)))) if path else None
+    subscription = RepoSubscription(repo, directory)
+    watcher.subscribe(subscription.on_change)
+
+    def start():
+        subscription.sync_watches()
+        subscription.head = subscription.read_head()
+        subscription.branches = subscription.read_branches()
+        subscription.files = subscription.read_files()
+        return {
+            "type": "snapshot",
+            "head": subscription.head,
+            "branches": subscription.branches,
+            "files": list(subscription.files.values()),
+        }
+
+    async def events():
+        try:
+            snapshot = await loop.run_in_executor(local_executor, start)
+            yield f"data: {json.dumps(snapshot, ensure_ascii=False)}\n\n"
+
+            signature = await loop.run_in_executor(local_executor, subscription.signature) \
+                if subscription.polling else None
+            last_sent = last_poll = time.monotonic()
+
+            while True:
+                await asyncio.sleep(EVENTS_POLL_INTERVAL)
+                now = time.monotonic()
+
+                if subscription.polling and now - last_poll >= EVENTS_FALLBACK_INTERVAL:
+                    last_poll = now
+                    current = await loop.run_in_executor(local_executor, subscription.signature)
+                    subscription.mark_dirty({flag for flag, old, new in zip(("head", "refs", "files"), signature, current)
+                                             if old != new})
+                    signature = current
+
+                dirty = subscription.take_dirty()
+                if dirty:
+                    for event in await loop.run_in_executor(local_executor, subscription.collect, dirty):
+                        yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+                        last_sent = now
+
+                if now - last_sent >= EVENTS_KEEPALIVE:
+                    yield ": keepalive\n\n"
+                    last_sent = now
+        finally:
+            subscription.close()
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+# Repository dashboard
+# 폴더 아래의 저장소들을 찾아서 브랜치 / ahead-behind / 변경 수를 프로세스 풀에서 동시에 수집한다.
+DASHBOARD_MAX_DEPTH = 6
+DASHBOARD_DEFAULT_DEPTH = 3
+DASHBOARD_MAX_REPOS = 500
+DASHBOARD_REPO_TIMEOUT = 10      # seconds per `git status`
+DASHBOARD_SCAN_TIMEOUT = 5       # seconds per folder scanned while discovering
+DASHBOARD_DISCOVERY_TIMEOUT = 30 # seconds for the whole discovery
+DASHBOARD_WORKERS = min(4, os.cpu_count() or 1)
+DASHBOARD_SCAN_WORKERS = 8
+DASHBOARD_SKIP_DIRS = {"node_modules", "__pycache__", "venv", "env", "build", "dist", "target",
+                       "bower_components", "$RECYCLE.BIN", "System Volume Information"}
+
+dashboard_executor = None
+dashboard_executor_lock = threading.Lock()
+# 응답 없는 네트워크 드라이브의 scandir 는 중단할 수 없으므로 다른 풀을 막지 않도록 따로 둔다
+discovery_executor = ThreadPoolExecutor(max_workers=DASHBOARD_SCAN_WORKERS, thread_name_prefix="dashboard-scan")
+
+
+def get_dashboard_executor() -> ProcessPoolExecutor:
+    # 처음 쓸 때 만든다 (Windows 에서는 worker 마다 이 모듈을 다시 import 하므로)
+    global dashboard_executor
+    with dashboard_executor_lock:
+        if dashboard_executor is None:
+            # fork 는 스레드가 많은 서버에서 잠긴 lock 까지 복사할 수 있어서 forkserver / spawn 을 쓴다
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            dashboard_executor = ProcessPoolExecutor(max_workers=DASHBOARD_WORKERS,
+                                                     mp_context=multiprocessing.get_context(method))
+        return dashboard_executor
+
+
+def discover_repositories(root: str, max_depth: int, found, cancel: threading.Event) -> list:
+    """Find working trees at most `max_depth` levels below `root` and call `found(path)`
+    for each one as soon as it is seen.
+
+    Hidden and well-known build / dependency folders are skipped, and a repository's
+    own folders are not searched for nested ones. A folder whose scan takes longer
+    than DASHBOARD_SCAN_TIMEOUT (a hung network mount) is given up on, and so is
+    everything still pending after DASHBOARD_DISCOVERY_TIMEOUT. Returns the folders
+    that were given up on.
+    """
+    started = {}
+
+    def scan(directory):
+        started[directory] = time.monotonic()
+        try:
+            with os.scandir(directory) as entries:
+                entries = list(entries)
+        except OSError:
+            return True, []
+        count_fs_calls(len(entries) + 1)
+        if any(entry.name == ".git" for entry in entries):
+            return True, [directory]
+        return False, [entry.path for entry in entries
+                       if entry.is_dir(follow_symlinks=False)
+                       and not entry.name.startswith(".") and entry.name not in DASHBOARD_SKIP_DIRS]
+
+    deadline = time.monotonic() + DASHBOARD_DISCOVERY_TIMEOUT
+    pending = {discovery_executor.submit(scan, root): (root, 0)}
+    given_up = []
+    count = 0
+
+    while pending:
+        done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+        for future in done:
+            directory, depth = pending.pop(future)
+            is_repo, paths = future.result()
+            if is_repo:
+                for path in paths:
+                    if count < DASHBOARD_MAX_REPOS:
+                        count += 1
+                        found(path)
+            elif depth < max_depth:
+                for path in paths:
+                    pending[discovery_executor.submit(scan, path)] = (path, depth + 1)
+
+        now = time.monotonic()
+        stop = cancel.is_set() or count >= DASHBOARD_MAX_REPOS or now > deadline
+        for future, (directory, depth) in list(pending.items()):
+            if stop or now - started.get(directory, now) > DASHBOARD_SCAN_TIMEOUT:
+                # 실행 중인 scan 은 멈출 수 없으니 결과만 버린다
+                future.cancel()
+                del pending[future]
+                if not cancel.is_set() and count < DASHBOARD_MAX_REPOS:
+                    given_up.append(directory)
+
+    if given_up:
+        logging.warning(f"Repository discovery gave up on {len(given_up)} folder(s) under {root}")
+    return given_up
+
+
+def collect_repo_summary(git_executable: str, path: str, timeout: float) -> dict:
+    """Process-pool worker: summarize one repository from `git status --porcelain=v2 --branch`.
+
+    Kept free of module state so it can run in a freshly spawned process.
+    """
+    summary = {'path': path, 'name': os.path.basename(path), 'branch': None, 'commit': None, 'upstream': None,
+               'ahead': None, 'behind': None, 'staged': 0, 'modified': 0, 'untracked': 0, 'conflicted': 0,
+               'dirty': False, 'error': None, 'git_seconds': 0.0}
+    env = dict(os.environ, GIT_OPTIONAL_LOCKS="0", GIT_TERMINAL_PROMPT="0")
+    started = time.perf_counter()
+    try:
+        result = subprocess.run(
+            [git_executable, "status", "--porcelain=v2", "--branch", "-z", "--untracked-files=normal"],
+            cwd=path, env=env, stdin=subprocess.DEVNULL, capture_output=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        summary['error'] = f"git status timed out after {timeout}s"
+        return summary
+    except OSError as e:
+        summary['error'] = str(e)
+        return summary
+    finally:
+        summary['git_seconds'] = time.perf_counter() - started
+
+    if result.returncode != 0:
+        summary['error'] = result.stderr.decode("utf-8", errors="replace").strip()
+        return summary
+
+    records = iter(result.stdout.decode("utf-8", errors="replace").split("\0"))
+    for record in records:
+        if record.startswith("# branch.oid "):
+            oid = record[len("# branch.oid "):]
+            summary['commit'] = None if oid == "(initial)" else oid
+        elif record.startswith("# branch.head "):
+            head = record[len("# branch.head "):]
+            summary['branch'] = None if head == "(detached)" else head
+        elif record.startswith("# branch.upstream "):
+            summary['upstream'] = record[len("# branch.upstream "):]
+        elif record.startswith("# branch.ab "):
+            ahead, behind = record[len("# branch.ab "):].split()
+            summary['ahead'], summary['behind'] = int(ahead), -int(behind)
+        elif record[:2] in ("1 ", "2 "):
+            x, y = record[2], record[3]
+            summary['staged'] += x != "."
+            summary['modified'] += y != "."
+            if record[0] == "2":
+                next(records, None)   # original path of a rename / copy
+        elif record.startswith("u "):
+            summary['conflicted'] += 1
+        elif record.startswith("? "):
+            summary['untracked'] += 1
+
+    summary['dirty'] = bool(summary['staged'] or summary['modified'] or summary['untracked'] or summary['conflicted'])
+    return summary
+
+
+@app.post("/api/repo_dashboard")
+async def repo_dashboard(request: FileItem):
+    """Branch, upstream ahead/behind and staged / modified / untracked / conflicted counts for
+    every repository below `path` (at most `depth` folders deep).
+
+    Repositories are summarized concurrently in a process pool as soon as discovery
+    finds them, each with its own timeout; discovery itself is time-bounded too.
+    With `stream`, one NDJSON line is sent per repository as it finishes, then
+    {"done": true, "count": n, "unscanned": [folders given up on]}; otherwise the
+    list is returned sorted by path.
+    """
+    root = request.path
+    if not root or not os.path.isdir(root):
+        raise HTTPException(status_code=404, detail="Directory not found")
+    depth = DASHBOARD_DEFAULT_DEPTH if request.depth is None else request.depth
+    if not 0 <= depth <= DASHBOARD_MAX_DEPTH:
+        raise HTTPException(status_code=400, detail=f"depth must be between 0 and {DASHBOARD_MAX_DEPTH}")
+
+    loop = asyncio.get_running_loop()
+    executor = get_dashboard_executor()
+    results = asyncio.Queue()   # summaries, then None once discovery is over
+    tasks = []
+    cancel = threading.Event()
+
+    async def summarize(path):
+        try:
+            summary = await asyncio.wrap_future(
+                executor.submit(collect_repo_summary, Git.GIT_PYTHON_GIT_EXECUTABLE, path, DASHBOARD_REPO_TIMEOUT))
+        except Exception as e:   # worker process died
+            summary = {'path': path, 'name': os.path.basename(path), 'error': str(e), 'git_seconds': 0.0}
+        record_git(request_metrics.get(), summary.pop('git_seconds'))
+        results.put_nowait(summary)
+
+    def start(path):
+        if not cancel.is_set():
+            tasks.append(asyncio.ensure_future(summarize(path)))
+
+    # repositories are summarized as soon as discovery finds them
+    discovery = loop.run_in_executor(
+        local_executor, contextvars.copy_context().run, discover_repositories, os.path.abspath(root), depth,
+        lambda path: loop.call_soon_threadsafe(start, path), cancel)
+    discovery.add_done_callback(lambda _: results.put_nowait(None))
+
+    async def summaries():
+        received = 0
+        discovered = False
+        try:
+            # every start() is queued on the loop before discovery's completion
+            while not discovered or received < len(tasks):
+                summary = await results.get()
+                if summary is None:
+                    discovered = True
+                else:
+                    received += 1
+                    yield summary
+        finally:
+            cancel.set()
+            for task in tasks:
+                task.cancel()
+
+    if not request.stream:
+        items = [summary async for summary in summaries()]
+        if discovery.exception() is not None:
+            raise HTTPException(status_code=500, detail=str(discovery.exception()))
+        return sorted(items, key=lambda summary: collation_key(summary['path']))
+
+    async def lines():
+        count = 0
+        async for summary in summaries():
+            count += 1
+            yield json.dumps(summary, ensure_ascii=False) + "\n"
+        given_up = discovery.result() if discovery.exception() is None else []
+        yield json.dumps({"done": True, "count": count, "unscanned": given_up}, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+# Clone jobs
+# clone을 백그라운드 작업으로 실행하고 job_id로 진행 상황 조회 / 취소
+CLONE_JOB_TTL = 3600  # seconds a finished job stays queryable
+
+CLONE_JOB_WORKERS = 2
+
+clone_jobs = {}   # job_id -> CloneJob
+clone_jobs_lock = threading.Lock()
+# clone 작업은 repo_status / clone_repo 와 풀을 나눠 쓰지 않도록 별도 풀에서 실행
+clone_executor = ThreadPoolExecutor(max_workers=CLONE_JOB_WORKERS, thread_name_prefix="git-clone")
+
+CLONE_STAGES = {
+    RemoteProgress.COUNTING: "counting",
+    RemoteProgress.COMPRESSING: "compressing",
+    RemoteProgress.RECEIVING: "receiving",
+    RemoteProgress.RESOLVING: "resolving",
+    RemoteProgress.FINDING_SOURCES: "finding_sources",
+    RemoteProgress.CHECKING_OUT: "checking_out",
+    RemoteProgress.WRITING: "writing",
+}
+
+
+def token_auth_env(url: str, access_token: str) -> dict:
+    """Environment that makes git send `access_token` to the host of `url`.
+
+    The header is passed through GIT_CONFIG_* (git 2.31+), so the token doesn't
+    show up on a command line or in the new clone's .git/config.
+    """
+    parsed = urlparse(url)
+    credentials = base64.b64encode(f"git:{access_token}".encode()).decode()
+    return {
+        "GIT_CONFIG_COUNT": "1",
+        "GIT_CONFIG_KEY_0": f"http.{parsed.scheme}://{parsed.netloc}/.extraHeader",
+        "GIT_CONFIG_VALUE_0": f"Authorization: Basic {credentials}",
+    }
+
+
+class CloneJob:
+    def __init__(self, url: str, path: str, options: list, env: dict):
+        self.id = uuid.uuid4().hex
+        self.url = url
+        self.path = path
+        self.options = options
+        self.env = env
+        self.status = "queued"    # queued / running / done / failed / cancelled
+        self.stage = None
+        self.objects_received = 0
+        self.objects_total = None
+        self.deltas_resolved = 0
+        self.deltas_total = None
+        self.transfer = ""        # e.g. "12.34 MiB | 3.21 MiB/s"
+        self.error = None
+        self.finished_at = None
+        self.version = 0          # bumped on every change, used by the event stream
+        self.cancel_requested = False
+        self.proc = None
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "path": self.path,
+            "status": self.status,
+            "stage": self.stage,
+            "objects_received": self.objects_received,
+            "objects_total": self.objects_total,
+            "deltas_resolved": self.deltas_resolved,
+            "deltas_total": self.deltas_total,
+            "transfer": self.transfer,
+            "error": self.error,
+        }
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+
+class CloneProgress(RemoteProgress):
+    def __init__(self, job: CloneJob):
+        super().__init__()
+        self.job = job
+
+    def update(self, op_code, cur_count, max_count=None, message=""):
+        job = self.job
+        stage = op_code & RemoteProgress.OP_MASK
+        job.stage = CLONE_STAGES.get(stage, job.stage)
+        if stage == RemoteProgress.RECEIVING:
+            job.objects_received = int(cur_count)
+            job.objects_total = int(max_count) if max_count else None
+            if message:
+                job.transfer = message.strip(", ")
+        elif stage == RemoteProgress.RESOLVING:
+            job.deltas_resolved = int(cur_count)
+            job.deltas_total = int(max_count) if max_count else None
+        job.version += 1
+
+
+def run_clone_job(job: CloneJob):
+    if job.cancel_requested:
+        return
+
+    job.status = "running"
+    job.version += 1
+    created = not os.path.exists(job.path)
+    progress = CloneProgress(job)
+    handler = progress.new_message_handler()
+
+    try:
+        job.proc = subprocess.Popen(
+            [Git.GIT_PYTHON_GIT_EXECUTABLE, "clone", "--progress", *job.options, "--", job.url, job.path],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, env=job.env)
+        watch_git_process(job.proc, None, time.perf_counter())
+        record_git(None, 0.0)
+        if job.cancel_requested:
+            job.proc.terminate()
+
+        # git은 진행률을 '\r'로 같은 줄에 덮어쓰므로 '\r'과 '\n' 모두에서 자른다
+        buffer = b""
+        while True:
+            chunk = job.proc.stderr.read1(4096)
+            if not chunk:
+                break
+            buffer += chunk
+            *lines, buffer = buffer.replace(b"\r", b"\n").split(b"\n")
+            for line in lines:
+                handler(line.decode("utf-8", errors="replace"))
+        if buffer:
+            handler(buffer.decode("utf-8", errors="replace"))
+
+        returncode = job.proc.wait()
+        if job.cancel_requested:
+            job.status = "cancelled"
+        elif returncode != 0:
+            job.status = "failed"
+            job.error = "\n".join(progress.error_lines + progress.other_lines[-5:]) or f"git clone exited with {returncode}"
+        else:
+            job.status = "done"
+            forget_repo_paths()
+    except Exception as e:
+        job.status = "failed"
+        job.error = str(e)
+    finally:
+        if job.status in ("failed", "cancelled") and created and os.path.exists(job.path):
+            shutil.rmtree(job.path, ignore_errors=True)
+        job.finished_at = time.monotonic()
+        job.version += 1
+
+
+def get_clone_job(job_id: str) -> CloneJob:
+    with clone_jobs_lock:
+        job = clone_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Clone job not found")
+    return job
+
+
+@app.post("/api/clone_job_start")
+async def clone_job_start(request: FileItem):
+    path = request.path
+    remote_path = request.remote_path
+    access_token = request.access_token
+
+    if not path or not remote_path:
+        raise HTTPException(status_code=400, detail="path and remote_path are required")
+
+    if os.path.exists(path) and (not os.path.isdir(path) or os.listdir(path)):
+        raise HTTPException(status_code=400, detail="Destination is not an empty directory")
+
+    # shallow / partial clone options
+    options = []
+    if request.depth:
+        if request.depth < 1:
+            raise HTTPException(status_code=400, detail="depth must be positive")
+        options.append(f"--depth={request.depth}")
+    if request.clone_filter:
+        options.append(f"--filter={request.clone_filter}")
+    if request.single_branch:
+        options.append("--single-branch")
+    if request.branch_name:
+        options.append(f"--branch={request.branch_name}")
+
+    env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+    if access_token:
+        env.update(token_auth_env(remote_path, access_token))
+
+    job = CloneJob(remote_path, path, options, env)
+
+    with clone_jobs_lock:
+        # Drop jobs that finished long ago
+        now = time.monotonic()
+        for job_id, old in list(clone_jobs.items()):
+            if old.finished and now - old.finished_at > CLONE_JOB_TTL:
+                del clone_jobs[job_id]
+        clone_jobs[job.id] = job
+
+    clone_executor.submit(run_clone_job, job)
+
+    return {"job_id": job.id}
+
+
+@app.post("/api/clone_job_status")
+async def clone_job_status(request: FileItem):
+    return get_clone_job(request.job_id).to_dict()
+
+
+@app.post("/api/clone_job_cancel")
+async def clone_job_cancel(request: FileItem):
+    job = get_clone_job(request.job_id)
+
+    if job.finished:
+        raise HTTPException(status_code=400, detail=f"Clone job already {job.status}")
+
+    job.cancel_requested = True
+    if job.proc is not None and job.proc.poll() is None:
+        job.proc.terminate()
+    elif job.status == "queued":
+        job.status = "cancelled"
+        job.finished_at = time.monotonic()
+    job.version += 1
+
+    return {"message": "Clone job cancelled"}
+
+
+@app.get("/api/clone_job_events")
+async def clone_job_events(job_id: str):
+    job = get_clone_job(job_id)
+
+    # server-sent events: 상태가 바뀔 때마다 전송, 작업이 끝나면 스트림 종료
+    async def events():
+        version = None
+        while True:
+            if job.version != version:
+                version = job.version
+                yield f"data: {json.dumps(job.to_dict())}\n\n"
+            if job.finished:
+                break
+            await asyncio.sleep(0.25)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/{path:path}", include_in_schema=False)
+async def catch_all(path: str):
+    return FileResponse("frontend/build/index.html")
+
+
+@app.get("/")
+async def read_root():
+    return FileResponse("frontend/build/index.html")
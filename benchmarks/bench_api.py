@@ -0,0 +1,314 @@
+"""Latency / memory benchmark for the backend API.
+
+Generates synthetic repositories, drives `backend.app` in-process with the FastAPI
+TestClient and reports latency percentiles and peak Python memory per endpoint.
+
+    python benchmarks/bench_api.py --dirs 20 --files-per-dir 200 --commits 2000 --branches 30
+    python benchmarks/bench_api.py --save-baseline            # store results as the baseline
+    python benchmarks/bench_api.py --fail-on-regression       # compare against it (exit 1 on regression)
+
+Needs `httpx` (used by the TestClient), which the server itself doesn't:
+`pip install httpx`.
+
+Each endpoint gets one "cold" call (caches empty, kept out of the percentiles) followed
+by `--iterations` warm calls; peak memory is measured in a separate traced pass so
+tracemalloc overhead doesn't leak into the latency numbers.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+COMMIT_EPOCH = 1_600_000_000
+
+
+def git(cwd, *args, **kwargs):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, **kwargs).stdout
+
+
+def file_path(d, f):
+    return f"dir{d:03d}/file{f:05d}.txt"
+
+
+def fast_import_stream(config, rng):
+    """fast-import stream: one initial commit with every file, then `commits - 1`
+    commits touching a few files each, and branches forking off along the way."""
+    marks = []
+    out = []
+
+    def commit(ref, mark, parent, message, changes):
+        out.append(f"commit {ref}\nmark :{mark}\n")
+        out.append(f"committer Bench <bench@example.com> {COMMIT_EPOCH + mark * 60} +0000\n")
+        data = message.encode()
+        out.append(f"data {len(data)}\n{message}\n")
+        if parent:
+            out.append(f"from :{parent}\n")
+        for path, content in changes:
+            data = content.encode()
+            out.append(f"M 100644 inline {path}\ndata {len(data)}\n{content}\n")
+
+    initial = [(file_path(d, f), f"{d} {f}\n" * 4)
+               for d in range(config.dirs) for f in range(config.files_per_dir)]
+    commit("refs/heads/main", 1, None, "initial", initial)
+    marks.append(1)
+
+    for mark in range(2, config.commits + 1):
+        changes = [(file_path(rng.randrange(config.dirs), rng.randrange(config.files_per_dir)), f"rev {mark}\n")
+                   for _ in range(config.changes_per_commit)]
+        commit("refs/heads/main", mark, mark - 1, f"commit {mark}\n\nsynthetic change", changes)
+        marks.append(mark)
+
+    next_mark = config.commits + 1
+    for b in range(config.branches):
+        base = marks[(b + 1) * len(marks) // (config.branches + 1)]
+        # 짝수 branch 는 자기 파일만 건드려서 깨끗하게 merge, 홀수 branch 는 main 과 같은 파일을 수정해서 충돌
+        path = f"branch{b:03d}.txt" if b % 2 == 0 else file_path(0, 0)
+        commit(f"refs/heads/bench{b:03d}", next_mark, base, f"branch {b}", [(path, f"branch {b}\n")])
+        next_mark += 1
+
+    if config.commits > 1:
+        commit("refs/heads/main", next_mark, config.commits, "touch conflict file", [(file_path(0, 0), "main\n")])
+    return "".join(out).encode()
+
+
+def make_repo(root, config, seed=0):
+    """Create a synthetic repository at `root` and dirty its working tree."""
+    rng = random.Random(seed)
+    os.makedirs(root)
+    git(root, "init", "-q")
+    git(root, "symbolic-ref", "HEAD", "refs/heads/main")
+    git(root, "fast-import", "--quiet", input=fast_import_stream(config, rng))
+    git(root, "reset", "-q", "--hard", "main")
+
+    for d in range(config.dirs):
+        for f in range(int(config.files_per_dir * config.untracked_ratio)):
+            with open(os.path.join(root, f"dir{d:03d}", f"untracked{f:05d}.txt"), "w") as fp:
+                fp.write("untracked\n")
+        for f in rng.sample(range(config.files_per_dir), int(config.files_per_dir * config.modified_ratio)):
+            with open(os.path.join(root, file_path(d, f)), "a") as fp:
+                fp.write("modified\n")
+    return root
+
+
+def make_merge_repo(source, root):
+    """Clean clone of `source` with the bench branches as local branches."""
+    git(os.path.dirname(root), "clone", "-q", source, root)
+    git(root, "config", "user.name", "Bench")
+    git(root, "config", "user.email", "bench@example.com")
+    for line in git(root, "for-each-ref", "--format=%(refname:short)", "refs/remotes/origin").decode().split():
+        name = line.split("/", 1)[1]
+        if name.startswith("bench"):
+            git(root, "branch", "-q", name, line)
+    return root
+
+
+def cases(repo, merge_repo, config):
+    """(name, method, url, kwargs, setup) for every benchmarked call."""
+    head = git(repo, "rev-parse", "HEAD").decode().strip()
+    middle = git(repo, "rev-parse", f"HEAD~{max(config.commits // 2, 1)}").decode().strip() \
+        if config.commits > 2 else head
+    merge_head = git(merge_repo, "rev-parse", "HEAD").decode().strip()
+    branches = [f"bench{b:03d}" for b in range(config.branches)]
+
+    def reset_merge_repo():
+        git(merge_repo, "reset", "-q", "--hard", merge_head)
+
+    result = [
+        ("get_files root", "GET", "/api/root_files", {"params": {"path": repo}}, None),
+        ("get_files subdir", "GET", "/api/root_files", {"params": {"path": os.path.join(repo, "dir000")}}, None),
+        ("get_files_page subdir", "GET", "/api/root_files_page",
+         {"params": {"path": os.path.join(repo, "dir000"), "limit": 200, "sort_by": "mtime"}}, None),
+        ("folder_summary root", "GET", "/api/folder_summary", {"params": {"path": repo}}, None),
+        ("git_history full", "POST", "/api/git_history", {"json": {"git_path": repo}}, None),
+        ("git_history page", "POST", "/api/git_history", {"json": {"git_path": repo, "page_size": 100}}, None),
+        ("commit_information", "POST", "/api/commit_information",
+         {"json": {"git_path": repo, "commit_checksum": middle}}, None),
+        ("changed_files initial", "POST", "/api/changed_files",
+         {"json": {"git_path": repo, "commit_checksum": git(repo, "rev-list", "--max-parents=0", "HEAD")
+                   .decode().split()[0]}}, None),
+        ("changed_files head", "POST", "/api/changed_files", {"json": {"git_path": repo, "commit_checksum": head}}, None),
+        ("get_staged_files", "POST", "/api/get_staged_files", {"json": {"path": repo}}, None),
+        ("branch_overview", "POST", "/api/branch_overview", {"json": {"git_path": repo}}, None),
+    ]
+    if branches:
+        result += [
+            ("branch_merge_preview all", "POST", "/api/branch_merge_preview",
+             {"json": {"git_path": repo, "branch_names": branches}}, None),
+            ("branch_merge clean", "POST", "/api/branch_merge",
+             {"json": {"git_path": merge_repo, "branch_name": branches[0]}}, reset_merge_repo),
+        ]
+    if len(branches) > 1:
+        result.append(("branch_merge conflict", "POST", "/api/branch_merge",
+                       {"json": {"git_path": merge_repo, "branch_name": branches[1]}}, reset_merge_repo))
+    return result
+
+
+def percentile(samples, q):
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[q - 1]
+
+
+def run_case(client, method, url, kwargs, setup, iterations):
+    def call():
+        if setup:
+            setup()
+        start = time.perf_counter()
+        response = client.request(method, url, **kwargs)
+        elapsed = (time.perf_counter() - start) * 1000
+        return elapsed, response
+
+    cold, response = call()
+    status = response.status_code
+    size = len(response.content)
+    samples = [call()[0] for _ in range(iterations)]
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    client.request(method, url, **kwargs)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "status": status,
+        "bytes": size,
+        "cold_ms": round(cold, 3),
+        "min_ms": round(min(samples), 3),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p90_ms": round(percentile(samples, 90), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "max_ms": round(max(samples), 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    """Names of cases whose p50 or p90 got slower than the baseline by more than `tolerance`."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in ("p50_ms", "p90_ms"):
+            if current[metric] > previous[metric] * (1 + tolerance) and \
+                    current[metric] - previous[metric] > min_delta_ms:
+                regressions.append(name)
+                break
+    return regressions
+
+
+def print_table(results, baseline):
+    header = f"{'endpoint':<28}{'status':>7}{'cold':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'peak KiB':>11}"
+    if baseline:
+        header += f"{'p50 vs base':>13}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        line = f"{name:<28}{r['status']:>7}{r['cold_ms']:>10.1f}{r['p50_ms']:>10.1f}{r['p90_ms']:>10.1f}" \
+               f"{r['p99_ms']:>10.1f}{r['peak_kib']:>11.1f}"
+        if baseline:
+            previous = baseline.get(name)
+            line += f"{r['p50_ms'] / previous['p50_ms']:>12.2f}x" if previous and previous["p50_ms"] else f"{'-':>13}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--dirs", type=int, default=10, help="directories in the synthetic repository")
+    parser.add_argument("--files-per-dir", type=int, default=200)
+    parser.add_argument("--commits", type=int, default=500)
+    parser.add_argument("--changes-per-commit", type=int, default=3)
+    parser.add_argument("--branches", type=int, default=10)
+    parser.add_argument("--untracked-ratio", type=float, default=0.1, help="untracked files per tracked file")
+    parser.add_argument("--modified-ratio", type=float, default=0.05, help="share of tracked files left modified")
+    parser.add_argument("--iterations", type=int, default=20, help="warm calls per endpoint")
+    parser.add_argument("--only", action="append", help="run only cases whose name contains this (repeatable)")
+    parser.add_argument("--workdir", help="where to create the repositories (default: a temp dir, removed afterwards)")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="overwrite the baseline with this run")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs the baseline (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="ignore slowdowns smaller than this")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    config = parser.parse_args()
+
+    # backend mounts frontend/build/static relative to the working directory
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    import logging
+    from fastapi.testclient import TestClient
+    import backend
+    logging.getLogger().setLevel(logging.WARNING)
+
+    workdir = config.workdir or tempfile.mkdtemp(prefix="filemanager-bench-")
+    try:
+        start = time.perf_counter()
+        repo = make_repo(os.path.join(workdir, "repo"), config)
+        merge_repo = make_merge_repo(repo, os.path.join(workdir, "merge"))
+        print(f"generated repositories in {time.perf_counter() - start:.1f}s under {workdir}", file=sys.stderr)
+
+        results = {}
+        with TestClient(backend.app, raise_server_exceptions=False) as client:
+            for name, method, url, kwargs, setup in cases(repo, merge_repo, config):
+                if config.only and not any(part in name for part in config.only):
+                    continue
+                results[name] = run_case(client, method, url, kwargs, setup, config.iterations)
+    finally:
+        if not config.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "config": {key: value for key, value in vars(config).items()
+                   if key in ("dirs", "files_per_dir", "commits", "changes_per_commit", "branches",
+                              "untracked_ratio", "modified_ratio", "iterations")},
+        "python": platform.python_version(),
+        "git": git(ROOT, "--version").decode().strip(),
+        "results": results,
+    }
+
+    baseline = None
+    if os.path.exists(config.baseline) and not config.save_baseline:
+        with open(config.baseline) as fp:
+            saved = json.load(fp)
+        # numbers from a differently sized run aren't comparable
+        differences = [f"{key}={value} (baseline {saved['config'].get(key)})"
+                       for key, value in report["config"].items() if saved["config"].get(key) != value]
+        if not differences:
+            baseline = saved["results"]
+        elif config.fail_on_regression:
+            sys.exit(f"baseline was recorded with a different configuration: {', '.join(differences)}")
+        else:
+            print(f"not comparing with the baseline, its configuration differs: {', '.join(differences)}",
+                  file=sys.stderr)
+
+    print_table(results, baseline)
+    if config.output:
+        with open(config.output, "w") as fp:
+            json.dump(report, fp, indent=2)
+    if config.save_baseline:
+        with open(config.baseline, "w") as fp:
+            json.dump(report, fp, indent=2)
+        print(f"baseline saved to {config.baseline}", file=sys.stderr)
+
+    if baseline:
+        regressions = compare(results, baseline, config.tolerance, config.min_delta_ms)
+        if regressions:
+            print(f"\nregressions: {', '.join(regressions)}", file=sys.stderr)
+            if config.fail_on_regression:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -30,7 +30,7 @@ const StyledBreadcrumbItem = styled(Breadcrumb.Item)`
 
 //파일 타입 받아오기 (폴더인지, 파일인지, (이건 깃 레포가 아닐 때)      언트랙인지, 모디파이드인지, 스테이징인지 커밋된건지 (이건 깃 레포일 때))
 type FileType =  "folder" | "file";
-type GitType = "null" | "untracked" | "modified" | "staged" | "committed" | "tracked" | "back";
+type GitType = "null" | "untracked" | "modified" | "staged" | "committed" | "tracked" | "ignored" | "back";
 
 type NameType = {
   fileName: string;
@@ -114,6 +114,39 @@ async function fetchFiles(path: string) {
   }
 }
 
+// 폴더 크기는 folder_summary 스트림(NDJSON)으로 하위 폴더마다 도착하는 대로 채운다
+// (root_files 의 폴더 size 는 디렉터리 inode 크기라서 표시하지 않는다)
+async function streamFolderSizes(path: string, signal: AbortSignal, onFolder: (name: string, size: number) => void) {
+  const encodedPath = encodeURIComponent(path);
+  const response = await fetch(`http://localhost:8000/api/folder_summary?path=${encodedPath}`, {
+    credentials: "include",
+    signal,
+  });
+
+  if (!response.ok || !response.body) {
+    throw new Error(`API request failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) {
+      break;
+    }
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split("\n");
+    buffer = lines.pop() ?? "";
+    for (const line of lines) {
+      if (line) {
+        const summary = JSON.parse(line);
+        onFolder(summary.name, summary.size);
+      }
+    }
+  }
+}
+
 export default function FileTable( { path, onPathChange }: FileTableProps) {
   const [tableHeight, setTableHeight] = useState<number>(0);
   const [fileList, setFileList] = useState<FileTableDataType[]>([]);
@@ -124,6 +157,7 @@ export default function FileTable( { path, onPathChange }: FileTableProps) {
   const [stagedArea, setStagedArea] = useState<Record<string, FileTableDataType[]>>({});
   const [commitModalVisible, setCommitModalVisible] = useState<boolean>(false);
   const [pathStack, setPathStack] = useState<string[]>([path]);
+  const [folderSizes, setFolderSizes] = useState<Record<string, number>>({});
 
   const columns: ColumnsType<FileTableDataType> = [
     {
@@ -162,7 +196,11 @@ export default function FileTable( { path, onPathChange }: FileTableProps) {
       title: "Size",
       dataIndex: "size",
       key: "size",
-      render: (value) => {
+      render: (value, record: FileTableDataType) => {
+        if (record.name.type_file === "folder") {
+          // recursive size from folder_summary, "-" until it arrives
+          value = folderSizes[record.name.fileName];
+        }
         if (!value) {
           return "-";
         }
@@ -321,6 +359,20 @@ export default function FileTable( { path, onPathChange }: FileTableProps) {
     fetchApi(path);
   }, [fetchApi, path]);
 
+  useEffect(() => {
+    const controller = new AbortController();
+    setFolderSizes({});
+    streamFolderSizes(path, controller.signal, (name, size) => {
+      setFolderSizes((sizes) => ({ ...sizes, [name]: size }));
+    }).catch((error) => {
+      if (!controller.signal.aborted) {
+        console.error("Error fetching folder sizes:", error);
+      }
+    });
+    // 다른 폴더로 이동하면 이전 폴더의 계산은 중단
+    return () => controller.abort();
+  }, [path]);
+
   //돌아가기
   const goBack = useCallback(() => {
     if (pathStack.length > 0) {